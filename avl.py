@@ -1,5 +1,7 @@
 """ AVL Tree implemented on top of the standard BST. """
 
+from __future__ import annotations
+
 __author__ = 'Alexey Ignatiev, with edits by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
@@ -32,6 +34,45 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         BinarySearchTree.__init__(self)
 
+    @classmethod
+    def from_sorted(cls, keys: List[K], items: List[I]) -> AVLTree:
+        """
+            Builds a balanced AVL tree from keys that are already sorted, without any rotations.
+            The middle key of each range becomes the root of that range's subtree.
+
+            :param arg1: keys in strictly increasing order (List)
+            :param arg2: items matching each key (List)
+
+            :pre: keys and items have the same length and keys are strictly increasing
+
+            :return: AVL tree containing every (key, item) pair (AVLTree)
+
+            :complexity: Best/Worst O(N), where N is the number of keys
+        """
+        if len(keys) != len(items):
+            raise ValueError("Number of keys does not equal number of items")
+        for k in range(1, len(keys)):
+            if not keys[k-1] < keys[k]:
+                raise ValueError(f"Keys should be strictly increasing, {keys[k-1]} is followed by {keys[k]}")
+
+        def build(lo: int, hi: int) -> AVLTreeNode:
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLTreeNode(keys[mid], items[mid])
+            left = node.left = build(lo, mid - 1)
+            right = node.right = build(mid + 1, hi)
+            left_height = left.height if left is not None else 0
+            right_height = right.height if right is not None else 0
+            node.height = (left_height if left_height > right_height else right_height) + 1
+            node.size = hi - lo + 1
+            return node
+
+        tree = cls()
+        tree.root = build(0, len(keys) - 1)
+        tree.length = len(keys)
+        return tree
+
     def get_height(self, current: AVLTreeNode) -> int:
         """
             Get the height of a node. Return current.height if current is
@@ -66,7 +107,9 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         if current is None:
             return 0
-        return self.get_height(current.right) - self.get_height(current.left)
+        left = current.left
+        right = current.right
+        return (right.height if right is not None else 0) - (left.height if left is not None else 0)
 
     def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
         """
@@ -86,29 +129,30 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         """
 
-        # Perform normal search on BST
-        if current is None:
-            # base case at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-        elif key > current.key:
-            # link to right edge for larger key
-            current.right = self.insert_aux(current.right, key, item)
-        elif key < current.key:
-            # link to left edge for smaller key
-            current.left = self.insert_aux(current.left, key, item)
-        else:
-            # raise ValueError when duplicated keys detected
-            raise ValueError(f"Duplicating item {item} for insertion.")
-
-        # Update height of ancestor node for current node
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-
-        # Update size of current node
-        current.size = self.size(current)
-
-        # Call rebalance function to balance the tree if needed
-        return self.rebalance(current)
+        # Perform normal search on BST, recording the path of (ancestor, went_right) pairs
+        # Keys are read once per level, so numeric keys (e.g. mining rates) are compared directly
+        path = []
+        push = path.append
+        while current is not None:
+            node_key = current.key
+            if key > node_key:
+                # descend right edge for larger key
+                push((current, True))
+                current = current.right
+            elif key < node_key:
+                # descend left edge for smaller key
+                push((current, False))
+                current = current.left
+            else:
+                # raise ValueError when duplicated keys detected
+                raise ValueError(f"Duplicating item {item} for insertion.")
+
+        # base case at the leaf
+        current = AVLTreeNode(key, item)
+        self.length += 1
+
+        # Walk back up the path relinking, updating and rebalancing each ancestor
+        return self.retrace(path, current, 1)
         
         
     def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
@@ -127,37 +171,94 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             :complexity: Best/Worst O(log N), where N is the total number of nodes of the tree
         """
 
+        # Perform normal search on BST, recording the path of (ancestor, went_right) pairs
+        path = []
+        push = path.append
+        while current is not None:
+            node_key = current.key
+            if key < node_key:
+                push((current, False))
+                current = current.left
+            elif key > node_key:
+                push((current, True))
+                current = current.right
+            else:
+                break
+
         if current is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key: do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case: find successor, then swap places
-            succ = self.get_successor(current)
+
+        # we found our key: do actual deletion
+        self.length -= 1
+        left = current.left
+        right = current.right
+        if left is None:        # leaf or only a right child
+            replacement = right
+        elif right is None:     # only a left child
+            replacement = left
+        else:
+            # general case: walk to the successor (leftmost node of the right subtree), recording the path
+            push((current, True))
+            succ = right
+            while succ.left is not None:
+                push((succ, False))
+                succ = succ.left
+
+            # swap places, then splice out the successor which has no left child
             current.key  = succ.key
             current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
+            replacement = succ.right
+
+        # Walk back up the path relinking, updating and rebalancing each ancestor
+        return self.retrace(path, replacement, -1)
+
+    def retrace(self, path: List[tuple[AVLTreeNode, bool]], child: AVLTreeNode, size_change: int) -> AVLTreeNode:
+        """
+            Walks back up the recorded search path after an insertion or deletion. Each ancestor is relinked to its
+            (possibly new) child, has its height and size updated and is rebalanced if needed.
+            Once an ancestor keeps both its height and its place as subtree root, nothing above it can become
+            unbalanced, so the remaining ancestors only have their sizes adjusted.
+
+            :param arg1: path - list of (ancestor, went_right) pairs from the root down to the changed position
+            :param arg2: child - new root of the subtree below the last ancestor in the path (AVLTreeNode or None)
+            :param arg3: size_change - change in the number of nodes, 1 for insertion and -1 for deletion
+
+            :pre: None
+
+            :return: new root of the tree (AVLTreeNode)
+
+            :complexity: Best O(1) when the height of the last ancestor is unchanged
+                         Worst O(log N), where N is the total number of nodes of the tree
+        """
+        for i in range(len(path) - 1, -1, -1):
+            parent, went_right = path[i]
+            if went_right:
+                parent.right = child
+            else:
+                parent.left = child
 
-            # Update the size for successor node
-            current.size = self.size(current)
+            left = parent.left
+            right = parent.right
+            old_height = parent.height
 
-        # Update height of ancestor node for current node
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
+            # Update height of ancestor node for current node
+            left_height = left.height if left is not None else 0
+            right_height = right.height if right is not None else 0
+            parent.height = (left_height if left_height > right_height else right_height) + 1
 
-        # Call rebalance function to balance the tree if needed
-        return self.rebalance(current)
+            # Update size of current node
+            parent.size = (left.size if left is not None else 0) + (right.size if right is not None else 0) + 1
+
+            # Call rebalance function to balance the tree if needed
+            child = self.rebalance(parent)
+
+            # Subtree unchanged in shape above this point: only the sizes of the remaining ancestors change
+            if child is parent and parent.height == old_height:
+                for k in range(i - 1, -1, -1):
+                    path[k][0].size += size_change
+                return path[0][0]
+
+        return child
 
     def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
         """
@@ -183,27 +284,31 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             :complexity: Best/Worst O(1)
         """
         # check precondition where current and its right child is not None
-        if current is None or current.right is None :
+        child = current.right if current is not None else None
+        if child is None:
             raise ValueError("Current and child should not be None")
 
-        # Get the links of current root
-        child = current.right
-        center = child.left
-
-        # Rotate
+        # Rotate, keeping the links needed for the updates below
+        current.right = center = child.left
         child.left = current
-        current.right = center
-
-        # Update height of rotated nodes
-        current.height = max(self.get_height(current.left),self.get_height(current.right)) + 1
-        child.height = max(self.get_height(child.left),self.get_height(child.right)) + 1
+        left = current.left
+        right = child.right
+
+        # Update height of rotated nodes, lower node first
+        left_height = left.height if left is not None else 0
+        center_height = center.height if center is not None else 0
+        right_height = right.height if right is not None else 0
+        current_height = (left_height if left_height > center_height else center_height) + 1
+        current.height = current_height
+        child.height = (current_height if current_height > right_height else right_height) + 1
         
-        # Update size of nodes after rotation
-        child.size = self.size(child)
-        current.size = self.size(current)
+        # Update size of nodes after rotation, lower node first
+        current_size = (left.size if left is not None else 0) + (center.size if center is not None else 0) + 1
+        current.size = current_size
+        child.size = current_size + (right.size if right is not None else 0) + 1
 
-        # Update new root as child after rotation
-        return self.rebalance(child)  
+        # A rotation called from rebalance leaves child balanced, so it is returned as is
+        return child
 
 
     def right_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
@@ -229,28 +334,144 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             :complexity: Best/Worst O(1)
         """
         # check precondition where current and its left child is not None
-        if current is None or current.left is None :
+        child = current.left if current is not None else None
+        if child is None:
             raise ValueError("Current and child should not be None")
 
+        # Rotate, keeping the links needed for the updates below
+        current.left = center = child.right
+        child.right = current
+        left = child.left
+        right = current.right
+
+        # Update height of rotated nodes, lower node first
+        left_height = left.height if left is not None else 0
+        center_height = center.height if center is not None else 0
+        right_height = right.height if right is not None else 0
+        current_height = (center_height if center_height > right_height else right_height) + 1
+        current.height = current_height
+        child.height = (left_height if left_height > current_height else current_height) + 1
+
+        # Update size of nodes after rotation, lower node first
+        current_size = (center.size if center is not None else 0) + (right.size if right is not None else 0) + 1
+        current.size = current_size
+        child.size = (left.size if left is not None else 0) + current_size + 1
+
+        # A rotation called from rebalance leaves child balanced, so it is returned as is
+        return child
+
+
+    def left_right_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Perform a left rotation of the left child followed by a right rotation of current, in one step.
+            The right child of current's left child, i.e. the grandchild, becomes the new root of the sub-tree.
+            Example:
+
+                         current                                     grandchild
+                        /       \                                   /          \
+                   child       r-tree     --------->           child          current
+                  /     \                                     /     \         /     \
+             l-tree    grandchild                        l-tree  g-left   g-right    r-tree
+                       /        \
+                   g-left      g-right
+
+            :param arg1: current node in tree (AVLTreeNode)
+
+            :pre: Current node, its left child and that child's right child are not None
+
+            :return: new root of subtree (AVLTreeNode)
+
+            :complexity: Best/Worst O(1)
+        """
         # Get the links of current root
         child = current.left
-        center = child.right
+        grandchild = child.right
+        left = child.left
+        right = current.right
+        g_left = grandchild.left
+        g_right = grandchild.right
+
+        # Restructure
+        child.right = g_left
+        current.left = g_right
+        grandchild.left = child
+        grandchild.right = current
+
+        # Update height of restructured nodes, lower nodes first
+        left_height = left.height if left is not None else 0
+        right_height = right.height if right is not None else 0
+        g_left_height = g_left.height if g_left is not None else 0
+        g_right_height = g_right.height if g_right is not None else 0
+        child_height = (left_height if left_height > g_left_height else g_left_height) + 1
+        current_height = (g_right_height if g_right_height > right_height else right_height) + 1
+        child.height = child_height
+        current.height = current_height
+        grandchild.height = (child_height if child_height > current_height else current_height) + 1
+
+        # Update size of restructured nodes, lower nodes first
+        child_size = (left.size if left is not None else 0) + (g_left.size if g_left is not None else 0) + 1
+        current_size = (g_right.size if g_right is not None else 0) + (right.size if right is not None else 0) + 1
+        child.size = child_size
+        current.size = current_size
+        grandchild.size = child_size + current_size + 1
+
+        return grandchild
+
+    def right_left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
+        """
+            Perform a right rotation of the right child followed by a left rotation of current, in one step.
+            The left child of current's right child, i.e. the grandchild, becomes the new root of the sub-tree.
+            Example:
 
-        # Rotate
-        child.right = current
-        current.left = center
+                 current                                             grandchild
+                /       \                                           /          \
+            l-tree     child             --------->           current          child
+                      /     \                                /     \         /     \
+                grandchild   r-tree                     l-tree  g-left   g-right    r-tree
+                /        \
+            g-left      g-right
 
-        # Update height of rotated nodes
-        child.height = max(self.get_height(child.left),self.get_height(child.right)) + 1
-        current.height = max(self.get_height(current.left),self.get_height(current.right)) + 1
+            :param arg1: current node in tree (AVLTreeNode)
 
-        # Update size of nodes after rotation
-        child.size = self.size(child)
-        current.size = self.size(current)
+            :pre: Current node, its right child and that child's left child are not None
 
-        # Update new root as child after rotation
-        return self.rebalance(child)
+            :return: new root of subtree (AVLTreeNode)
 
+            :complexity: Best/Worst O(1)
+        """
+        # Get the links of current root
+        child = current.right
+        grandchild = child.left
+        left = current.left
+        right = child.right
+        g_left = grandchild.left
+        g_right = grandchild.right
+
+        # Restructure
+        current.right = g_left
+        child.left = g_right
+        grandchild.left = current
+        grandchild.right = child
+
+        # Update height of restructured nodes, lower nodes first
+        left_height = left.height if left is not None else 0
+        right_height = right.height if right is not None else 0
+        g_left_height = g_left.height if g_left is not None else 0
+        g_right_height = g_right.height if g_right is not None else 0
+        current_height = (left_height if left_height > g_left_height else g_left_height) + 1
+        child_height = (g_right_height if g_right_height > right_height else right_height) + 1
+        current.height = current_height
+        child.height = child_height
+        grandchild.height = (current_height if current_height > child_height else child_height) + 1
+
+        # Update size of restructured nodes, lower nodes first
+        current_size = (left.size if left is not None else 0) + (g_left.size if g_left is not None else 0) + 1
+        child_size = (g_right.size if g_right is not None else 0) + (right.size if right is not None else 0) + 1
+        current.size = current_size
+        child.size = child_size
+        grandchild.size = current_size + child_size + 1
+
+        return grandchild
 
     def rebalance(self, current: AVLTreeNode) -> AVLTreeNode:
         """ Compute the balance of the current node.
@@ -258,8 +479,8 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             Rebalancing should be done either by:
             - one left rotate
             - one right rotate
-            - a combination of left + right rotate
-            - a combination of right + left rotate
+            - a combination of left + right rotate, done in one step by left_right_rotate
+            - a combination of right + left rotate, done in one step by right_left_rotate
             returns the new root of the subtree.
 
             :param arg1: current node in tree (AVLTreeNode)
@@ -270,18 +491,24 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
             :complexity: Best/Worst O(1)
         """
-        current.size = self.size(current)
-
-        if self.get_balance(current) >= 2:
-            child = current.right
-            if self.get_height(child.left) > self.get_height(child.right):
-                current.right = self.right_rotate(child)
+        left = current.left
+        right = current.right
+        left_height = left.height if left is not None else 0
+        right_height = right.height if right is not None else 0
+        balance = right_height - left_height
+
+        if balance >= 2:
+            inner = right.left
+            outer = right.right
+            if (inner.height if inner is not None else 0) > (outer.height if outer is not None else 0):
+                return self.right_left_rotate(current)
             return self.left_rotate(current)
 
-        if self.get_balance(current) <= -2:
-            child = current.left
-            if self.get_height(child.right) > self.get_height(child.left):
-                current.left = self.left_rotate(child)
+        if balance <= -2:
+            inner = left.right
+            outer = left.left
+            if (inner.height if inner is not None else 0) > (outer.height if outer is not None else 0):
+                return self.left_right_rotate(current)
             return self.right_rotate(current)
 
         return current
@@ -300,96 +527,111 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         :return: sorted list of items in the tree between ith and jth indices inclusive (List)
 
-        :complexity: Best/Worst O(j-i*log(N)), where N is the total number of nodes in the tree.
+        :complexity: Best/Worst O(log(N) + j-i), where N is the total number of nodes in the tree.
         
         """
         #check precondition
-        try:
-            N = self.size(self.root)
-            assert (i >= 0 and i <= N+1) and (j >= 0 and j <= N+1) and j>=i, f"i and j should be in range 0 to N-1, where N is the number of nodes in tree, current N is {N}"
-        except AssertionError as e:
-            raise ValueError(e)
+        root = self.root
+        N = root.size if root is not None else 0
+        if not (0 <= i <= N+1 and 0 <= j <= N+1 and j >= i):
+            raise ValueError(f"i and j should be in range 0 to N-1, where N is the number of nodes in tree, current N is {N}")
         
-        res =  self.range_aux(self.root, i, j)  # call the range_aux method for recursive searching and result
-
-        # check postcondition
-        if not isinstance(res,list):
-            raise Exception(f"Object of list class is not returned")
-        return res
+        return self.range_aux(root, i, j)  # call the range_aux method for the in-order walk and result
 
     
-    def range_aux(self, current: AVLTreeNode, i: int, j: int, res: list|None = None) -> list:
+    def range_aux(self, current: AVLTreeNode, i: int, j: int) -> list:
         """
         Auxillary function for range_between, attemps to add items within ith to jth range inclusive.
-        Calls the recursive method to lookup for index-th item in tree.
+        Descends once to the ith node using the subtree sizes, stacking the ancestors still to be visited, then
+        continues with an in-order walk until the jth item has been added.
 
-        :param arg1: ith index to get the elements (int)
-        :param arg2: jth index to get the elements (int)
+        :param arg1: current node in tree (AVLTreeNode)
+        :param arg2: ith index to get the elements (int)
+        :param arg3: jth index to get the elements (int)
 
         :pre: None
 
         :return: sorted list of items in the tree between ith and jth indices inclusive (List)
 
-        :complexity: Best/Worst O(j-i*log(N)), where N is the total number of nodes in the tree
+        :complexity: Best/Worst O(log(N) + j-i), where N is the total number of nodes in the tree
         
         """
 
-        if res is None:
-            res = []
-        if current is None or i > j:
-            return res
-        else:
-            node = self.lookup(self.root, i)
-            res.append(node.item)
-            return self.range_aux(self.root, i+1,j,res)
+        # the result holds the ith to jth items, clipped to the number of nodes in the tree
+        total = current.size if current is not None else 0
+        count = (j if j < total else total - 1) - i + 1
+        if count <= 0:
+            return []
+        res = [None] * count
+
+        # descend to the ith node, keeping the nodes whose left subtree we entered since they come later in order
+        stack = []
+        index = i
+        while current is not None:
+            left = current.left
+            left_size = left.size if left is not None else 0
+            if index < left_size:       # ith node is in the left subtree
+                stack.append(current)
+                current = left
+            elif index == left_size:    # found the ith node
+                stack.append(current)
+                break
+            else:                       # skip current and its left subtree
+                index -= left_size + 1
+                current = current.right
+
+        # in-order walk from the ith node until the jth item is added
+        push = stack.append
+        pop = stack.pop
+        for k in range(count):
+            node = pop()
+            res[k] = node.item
+            current = node.right
+            while current is not None:
+                push(current)
+                current = current.left
+
+        return res
 
 
     def lookup(self, node: AVLTreeNode, index: int) -> AVLTreeNode:
         """
-        Returns the node at position index in the AVLTree. Searches the index-th item recursively.
+        Returns the node at position index in the AVLTree. Searches the index-th item iteratively using the subtree sizes.
 
         :param arg1: current node in tree (AVLTreeNode)
         :param arg1: index of item to get (int)
 
-        :pre: None
+        :pre: 0 <= index < size of the subtree rooted at node
 
         :return: node at i-th index (AVLTreeNode)
 
         :complexity: O(log N), where N is the number of nodes in the AVLTree, since it is a balanced binary search tree.
 
         """
-        if index == self.size(node.left):   # return node when found
-            return node
-        elif index < self.size(node.left):  #  lookup the index-th element in left subtree
-            return self.lookup(node.left, index)
-        else:                               # lookup the (index-left subtree size - 1)th element in the right subtree
-            return self.lookup(node.right, index - self.size(node.left) - 1)
+        while True:
+            left = node.left
+            left_size = left.size if left is not None else 0
+            if index == left_size:      # return node when found
+                return node
+            elif index < left_size:     #  lookup the index-th element in left subtree
+                node = left
+            else:                       # lookup the (index-left subtree size - 1)th element in the right subtree
+                index -= left_size + 1
+                node = node.right
         
 
     def size(self, current: AVLTreeNode) -> int:
         """
-        Update and returns the size of the tree with current node as the "root".
-        In general: size of tree = size of left subtree + size of right subtree + 1 (size of "root")
+        Returns the size of the tree with current node as the "root".
+        The size is maintained on every node by insertion, deletion and rotation, so it is only read here.
 
         :param arg1: current node in tree (AVLTreeNode)
 
         :pre: None
 
-        :return: size of current node (int)
+        :return: size of current node, 0 if current is None (int)
 
-        :complexity: O(1), since it access the attributes of the nodes, assuming that we ignore comparison complexity.
+        :complexity: Best/Worst O(1)
 
         """
-        if current is None:         # return 0 when current is not a node
-            return 0
-
-        if self.is_leaf(current):   # update current size as 1 when current is leaf
-            current.size = 1
-        elif current.left is None:  # update current size as right child size + 1 when there is no left child
-            current.size = current.right.size + 1
-        elif current.right is None: # update current size as left child size + 1 when there is no right child
-            current.size = current.left.size + 1
-        else:                       # update current size as left and right child size + 1
-            current.size = current.left.size + current.right.size + 1
-
-        return current.size     # returns the size of current node
+        return current.size if current is not None else 0
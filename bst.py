@@ -8,8 +8,7 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
-from linked_stack import LinkedStack
+from typing import TypeVar, Generic, Iterator
 from node import TreeNode
 import sys
 
@@ -23,7 +22,7 @@ T = TypeVar('T')
 class BSTInOrderIterator:
     """ 
         In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
+        Performs stack-based BST traversal, using a Python list as the stack.
     """
 
     def __init__(self, root: TreeNode[K, I]) -> None:
@@ -39,7 +38,7 @@ class BSTInOrderIterator:
             :complexity: Best/Worst O(1)
         """
 
-        self.stack = LinkedStack()
+        self.stack = []
         self.current = root
 
     def __iter__(self) -> BSTInOrderIterator:
@@ -72,14 +71,16 @@ class BSTInOrderIterator:
             :complexity: Best/Worst O(N), where N is the number of nodes of the tree
         """
 
-        while self.current:
-            self.stack.push(self.current)
-            self.current = self.current.left
+        stack = self.stack
+        current = self.current
+        while current is not None:
+            stack.append(current)
+            current = current.left
 
-        if self.stack.is_empty():
+        if not stack:
             raise StopIteration
 
-        result = self.stack.pop()
+        result = stack.pop()
         self.current = result.right
 
         return result.key
@@ -143,21 +144,43 @@ class BinarySearchTree(Generic[K, I]):
 
             :return: bool - True if the key exists
 
-            :complexity: see __getitem__(self, key: K) -> (K, I)
+            :complexity: Same search as __getitem__(self, key: K) -> (K, I), without raising and catching a KeyError on a miss
                          Best O(CompK) finds item in root of tree
                          Worst O(CompK * D) item is not found, where D is depth of tree
                          CompK is complexity of comparing the keys
         """
-        try:
-            _ = self[key]
-        except KeyError:
-            return False
-        else:
-            return True
+        current = self.root
+        while current is not None:
+            node_key = current.key
+            if key == node_key:
+                return True
+            current = current.left if key < node_key else current.right
+        return False
 
-    def __iter__(self) -> BSTInOrderIterator:
-        """ Create an in-order iterator. """
-        return BSTInOrderIterator(self.root)
+    def __iter__(self) -> Iterator[K]:
+        """ 
+            Create an in-order iterator over the keys.
+            Performs the same stack-based traversal as BSTInOrderIterator as a generator.
+
+            :param: None
+
+            :pre: None
+
+            :return: generator yielding the keys in order
+
+            :complexity: Best/Worst O(N) for the full traversal, where N is the number of nodes of the tree
+        """
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        current = self.root
+        while stack or current is not None:
+            while current is not None:
+                push(current)
+                current = current.left
+            current = pop()
+            yield current.key
+            current = current.right
 
     def __getitem__(self, key: K) -> I:
         """
@@ -193,7 +216,7 @@ class BinarySearchTree(Generic[K, I]):
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
         """
-            Actually searches for a node by its key. Returns the node if found, raises KeyError if not found.
+            Actually searches for a node by its key, iteratively. Returns the node if found, raises KeyError if not found.
 
             :param arg1: current - The object of TreeNode
 
@@ -207,14 +230,15 @@ class BinarySearchTree(Generic[K, I]):
                          Worst O(D*CompK), where D is the tree depth
                          CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        while current is not None:
+            node_key = current.key
+            if key == node_key:  # found
+                return current
+            elif key < node_key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))  # reached an empty subtree
 
     def __setitem__(self, key: K, item: I) -> None:
         """
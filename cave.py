@@ -118,6 +118,9 @@ class Cave:
         * is_visited: Flag that indicates that a cave has been visited. Helps prepare caves for next day.
 
     """
+
+    __slots__ = ('name', 'material', 'quantity', 'mined_quantity', 'remaining_quantity', 'is_visited')
+
     def __init__(self, name: str, material: Material, quantity: float=0) -> None:
         """
             Initialises attributes
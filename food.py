@@ -4,11 +4,13 @@ Food. Players purchase them with emeralds to get hunger bars so that they can mi
 Food objects have a name, a price and a certain number of hunger points it provides to the player. Supports random generation of a food item. 
 """
 from __future__ import annotations
+import sys
 
 from random_gen import RandomGen
 
 # List of food names from https://github.com/vectorwing/FarmersDelight/tree/1.18.2/src/main/resources/assets/farmersdelight/textures/item
-FOOD_NAMES = [
+# Stored as a tuple of interned strings, so names of generated foods compare by identity first
+FOOD_NAMES = tuple(sys.intern(name) for name in (
     "Apple Cider",
     "Apple Pie",
     "Apple Pie Slice",
@@ -92,7 +94,10 @@ FOOD_NAMES = [
     "Tomato Seeds",
     "Vegetable Noodles",
     "Vegetable Soup",
-]
+))
+
+# printf-style template for Food.__str__: name, price, hunger bars
+FOOD_STR_FORMAT = "%s %s💰 for %s🍗"
 
 class Food:
     """
@@ -104,6 +109,8 @@ class Food:
         * Price: The emerald cost of the food. This is fixed.
 
     """
+
+    __slots__ = ('name', 'hunger_bars', 'price')
     
     def __init__(self, name: str, hunger_bars: int, price: int) -> None:
         """
@@ -136,7 +143,7 @@ class Food:
             :complexity: Best/Worst O(1)
         """
 
-        return f"{self.name} {self.price}💰 for {self.hunger_bars}🍗"
+        return FOOD_STR_FORMAT % (self.name, self.price, self.hunger_bars)
 
     @classmethod
     def random_food(cls) -> Food:
@@ -156,6 +163,31 @@ class Food:
         random_price = RandomGen.randint(10, 20) # arbitrary generation of price of food
         return Food(random_name, random_hunger_bars, random_price)
 
+    @classmethod
+    def random_food_batch(cls, amount: int) -> list[Food]:
+        """
+            Generates and returns <amount> random foods in one call.
+            Draws from RandomGen in the same order as calling random_food <amount> times, so seeded runs are unchanged.
+
+            :param: amount - the number of foods to generate
+
+            :pre: None
+            
+            :return: list of random food objects
+
+            :complexity: Best/Worst O(N), where N is <amount>
+        """
+        randint = RandomGen.randint
+        names = FOOD_NAMES
+        last_name = len(names) - 1
+        foods = [None] * amount
+        for i in range(amount):
+            random_name = names[randint(0, last_name)] # same draw as RandomGen.random_choice(FOOD_NAMES)
+            random_hunger_bars = randint(10, 400)
+            random_price = randint(10, 20)
+            foods[i] = cls(random_name, random_hunger_bars, random_price)
+        return foods
+
 if __name__ == "__main__":
     print(Food.random_food())
 
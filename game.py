@@ -12,18 +12,17 @@ from heap import MaxHeap
 
 from player import Player
 from trader import *
+from trader import _TRADER_CLASSES
 from material import Material
 from cave import Cave
 from food import Food
 from random_gen import RandomGen
 from aset import ASet
-from hash_table import LinearProbeTable
 from player import Player
 from avl import AVLTree
 
 from constants import EPSILON
 from avl import AVLTree
-from hash_table import LinearProbeTable
 
 class Game:
     """
@@ -62,8 +61,11 @@ class Game:
         """
         self.materials = []
         self.caves = []
+        self.cave_names = frozenset() # names of the generated caves, caves are equal if their names are equal
         self.traders = []
         self.trader_deals = None
+        self._trader_deals_pool = None # dict reused by generate_trader_deals_table across days
+        self._trader_deals_dirty = True # True when trader deals may have changed since trader_deals was built
 
     def initialise_game(self) -> None:
         """
@@ -104,7 +106,7 @@ class Game:
 
             :return: None
 
-            :complexity: Best/Worst O(1)
+            :complexity: Best/Worst O(C), where C is the number of caves
         """
         self.set_materials(materials)
         self.set_caves(caves)
@@ -134,9 +136,10 @@ class Game:
 
             :return: None
         
-            :complexity: Best/Worst O(1)
+            :complexity: Best/Worst O(C), where C is the number of caves
         """
         self.caves = caves
+        self.cave_names = frozenset(cave.name for cave in caves)
 
     def set_traders(self, traders: list[Trader]) -> None:
         """
@@ -151,6 +154,7 @@ class Game:
             :complexity: Best/Worst O(1)
         """
         self.traders = traders
+        self._trader_deals_dirty = True
 
     def get_materials(self) -> list[Material]:
         """
@@ -196,9 +200,9 @@ class Game:
 
     def generate_random_materials(self, amount) -> None:
         """
-            Generates <amount> random materials using Material.random_material
+            Generates <amount> random materials using Material.random_material_batch
             Generated materials must all have different names and different mining_rates. (Defined in __eq__ of Material)
-            (You may have to call Material.random_material more than <amount> times.)
+            (You may have to generate more than <amount> materials.)
 
             :param: amount - the amount of materials I wish to ramdonly generate
 
@@ -206,7 +210,7 @@ class Game:
 
             :return: None
 
-            :complexity: Best O(N^2), where N is the amount of Materialto be randomly generated
+            :complexity: Best O(N), where N is the amount of Materialto be randomly generated
                          Worst O(infinity), when set of unique objects never becomes full
         """
         self.generate_random(Material, amount)
@@ -223,7 +227,7 @@ class Game:
 
             :return: None
 
-            :complexity: Best O(N^2), where N is the amount of Cave to be randomly generated
+            :complexity: Best O(N), where N is the amount of Cave to be randomly generated
                          Worst O(infinity), when set of unique objects never becomes full
         """
         self.generate_random(Cave, amount)
@@ -246,7 +250,7 @@ class Game:
                          where M is the number of materials
                          Worst O(infinity), when set of unique objects never becomes full
         """
-        self.generate_random(Trader, amount) # generates the traders first, O(N^2)
+        self.generate_random(Trader, amount) # generates the traders first, O(N)
         
         # Give each trader randomized inventory
         materials = self.get_materials()
@@ -271,64 +275,50 @@ class Game:
 
             :return: None
 
-            :complexity: Best O(N^2), where N is the amount of either Material or Cave or Trader to be randomly generated
+            :complexity: Best O(N), where N is the amount of either Material or Cave or Trader to be randomly generated
                          Worst O(infinity), when set of unique objects never becomes full
         """
       
-        hash_table = LinearProbeTable(amount, amount) 
-        rand_elem = None
-        temp = [] # to store generated objects 
-
-        # Select appropriate random callable to generate material/cave/trader and the correspondng setter
-        if elem_type == Material:
-            mining_rate_tracker = []
-            rand_elem = lambda: Material.random_material() # callable which returns a material
-           
-            # Fill the set with <amount> elements by calling rand_elem. May need to call more than <amount> times
-            # Best case if <amount>, N = 4: O(1) + O(N-3) + O(N-2) + O(N-1) + O(N) --> O(N^2)
-            while len(hash_table) < amount: # Best case executes <amount> times, worst case executes infinite times(unlikely)
-                material = rand_elem()
-                if material.name not in hash_table and material.mining_rate not in mining_rate_tracker:
-                    hash_table.insert(material.name, material) # Best O(1), Worst O(N), where N is the number of elements currently in the set
-                    mining_rate_tracker.append(material.mining_rate)
-                
-            # Set materials, O(<amount>)
-            for i in range(len(hash_table.table)):
-                if hash_table.table[i] != None:
-                    temp.append(hash_table.table[i][1])
-            self.set_materials(temp)
-        
-        elif elem_type == Cave:
-            rand_elem = lambda: Cave.random_cave(self.materials) # callable which returns a cave
-            
-            # Fill the set with <amount> elements by calling rand_elem. May need to call more than <amount> times
-            while len(hash_table) < amount: # Best case executes <amount> times, worst case executes infinite times(unlikely)
-                cave = rand_elem()
-                if cave.name not in hash_table:
-                    hash_table.insert(cave.name, cave)
-            
-            # Set caves, O(<amount>)
-            for i in range(len(hash_table.table)):
-                if hash_table.table[i] != None:
-                    temp.append(hash_table.table[i][1])
-            self.set_caves(temp)
-        
-        elif elem_type == Trader:
-            while len(hash_table) < amount: # Best case executes <amount> times, worst case executes infinite times(unlikely)
-                rand_name = Trader.random_trader().name # Select random name
-                rand_type = RandomGen.random_choice([RandomTrader, RangeTrader, HardTrader]) # Select trader type
-                trader = rand_type(rand_name) # callable which returns a trader, O(M), where M is the size of the inventory
-                if trader.name not in hash_table:
-                    hash_table.insert(trader.name, trader)
-            
-            # Set traders, O(<amount>)
-            for i in range(len(hash_table.table)):
-                if hash_table.table[i] != None:
-                    # print(hash_table.table[i])
-                    temp.append(hash_table.table[i][1])
-            self.set_traders(temp)
+        # The batch callable returning n random objects, the corresponding setter and the attributes (besides name) that must be unique for each type
+        gen_spec = {
+            Material: (Material.random_material_batch, self.set_materials, ('mining_rate',)),
+            Cave: (lambda n: [Cave.random_cave(self.materials) for _ in range(n)], self.set_caves, ()),
+            Trader: (lambda n: [self._random_trader() for _ in range(n)], self.set_traders, ()),
+        }
+        rand_batch, setter, unique_attrs = gen_spec[elem_type]
+
+        accepted = [] # generated objects in the order they were accepted
+        names = set() # names already accepted, O(1) membership test
+        trackers = [(attr, set()) for attr in unique_attrs] # values already accepted for each extra unique attribute
+
+        # Fill the list with <amount> elements, drawing only as many as are still missing each round. No batch is larger than
+        # what is still needed, so RandomGen is drawn exactly as when generating one object at a time until <amount> are accepted
+        while len(accepted) < amount: # Best case executes once, worst case executes infinite times(unlikely)
+            for elem in rand_batch(amount - len(accepted)):
+                if elem.name in names or any(getattr(elem, attr) in seen for attr, seen in trackers): # O(1)
+                    continue
+                names.add(elem.name)
+                for attr, seen in trackers:
+                    seen.add(getattr(elem, attr))
+                accepted.append(elem)
+        setter(accepted)
+
+    def _random_trader(self) -> Trader:
+        """
+            Generates a trader with a random name and a randomly selected trader type.
+
+            :param: None
+
+            :pre: None
+
+            :return: An object of RandomTrader or RangeTrader or HardTrader
+
+            :complexity: Best/Worst O(M), where M is the size of the inventory
+        """
+        rand_name = Trader.random_trader().name # Select random name
+        rand_type = RandomGen.random_choice(_TRADER_CLASSES) # Select trader type, from the tuple Trader.random_trader uses
+        return rand_type(rand_name)
 
-        
     def finish_day(self) -> None:
         """
             DO NOT CHANGE
@@ -353,6 +343,7 @@ class Game:
     def generate_trader_deals_table(self) -> None:
         """
             Setup the trader deals for the day, updates material with higher traded price if material already exist in the hash table.
+            Does nothing if the table is still valid, i.e. no trader has generated a new deal since it was built.
             
             :param: None
 
@@ -360,20 +351,26 @@ class Game:
 
             :return: None
             
-            :complexity: Best/Worst O(T), where T is the number of traders
+            :complexity: Best O(1) if the table is still valid, Worst O(T), where T is the number of traders
         """
+        if not self._trader_deals_dirty:
+            return
         # setup trader_deals(best prices) for the day
-        self.trader_deals = LinearProbeTable(len(self.traders), -1) # hash table with current material as key and trader as data
+        # dict with current material name as key and trader as data, reused across days
+        trader_deals = self._trader_deals_pool
+        if trader_deals is None:
+            trader_deals = self._trader_deals_pool = {}
+        else:
+            trader_deals.clear() # O(T)
+        self.trader_deals = trader_deals
         for trader in self.traders: # O(T)
             material = trader.current_material.name # get current trader's material name as key
-            if material in self.trader_deals: # if there is an existing trader in the table selling the same material, O(1) search
-                price = self.trader_deals[material].current_price # get the existing trader's price, O(1) access
+            existing = trader_deals.get(material) # existing trader in the table selling the same material, O(1) search
 
-                # if current trader's price is higher than in the table, replace existing trader with current trader
-                if trader.current_price > price:
-                    self.trader_deals.insert(material, trader) # Assumed O(1)
-            else:
-                self.trader_deals.insert(material, trader) # otherwise it is a new insert, assumed O(1)
+            # if there is no such trader, or current trader's price is higher, the current trader holds the best deal
+            if existing is None or trader.current_price > existing.current_price:
+                trader_deals[material] = trader # O(1)
+        self._trader_deals_dirty = False
 
 class SoloGame(Game):
     """
@@ -424,10 +421,7 @@ class SoloGame(Game):
             :complexity: Best/Worst O(1)
         """
         super().initialise_with_data(materials, caves, traders)
-        self.player = Player(player_names[0], emeralds=emerald_info[0])
-        self.player.set_materials(self.get_materials())
-        self.player.set_caves(self.get_caves())
-        self.player.set_traders(self.get_traders())
+        self.player = Player(player_names[0], emeralds=emerald_info[0], materials=self.get_materials(), caves=self.get_caves(), traders=self.get_traders())
 
     def simulate_day(self) -> None:
         """
@@ -454,14 +448,13 @@ class SoloGame(Game):
         # Best O(T) if all are RandomTraders, Worst O(T * N (CompK * N)) if all are Range/HardTraders
         for trader in self.get_traders(): # O(T)
             trader.generate_deal() # Best O(1) if RandomTrader, Worst O(N (CompK * N) if Range/HardTrader
+        self._trader_deals_dirty = True # new deals, trader_deals must be rebuilt
         # print("Traders Deals:\n\t", end="")
         # print("\n\t".join(map(str, self.get_traders())))
 
         # 2. Food is offered
         food_num = RandomGen.randint(self.MIN_FOOD, self.MAX_FOOD) # number of foods
-        foods = []
-        for _ in range(food_num): # O(F), where F is number of foods
-            foods.append(Food.random_food())
+        foods = Food.random_food_batch(food_num) # O(F), where F is number of foods
         # print("\nFoods:\n\t", end="")
         # print("\n\t".join(map(str, foods)))
         self.player.set_foods(foods)
@@ -510,15 +503,17 @@ class SoloGame(Game):
         :complexity: Best/Worst O(C+F+T+[FM + F(log C)]), where M, T, F and C represent the number of traders, foods and caves respectively.
 
         """
+        player = self.player
         # check precondition O(C), C is number of caves generated
         try:
             assert food is None or isinstance(food,Food), "Food should be food object or None"
-            assert balance is not None and isinstance(balance, float) or isinstance(balance, int), "Balance should be float object"
-            assert caves is not None and isinstance(caves,list), "Caves should be list object"
-            assert len(caves) == 0 or len(caves) <= len(self.player.caves_list), "Caves list should not exceed length of caves generated"
-            if len(caves) > 0:
-                assert all(isinstance(details,tuple) and len(details)==2 for details in caves), "Caves list should contain tuple of length 2 (cave, mined quantity)"
-                assert all(isinstance(cave, Cave) and (isinstance(mined,float) or isinstance(mined,int)) for cave, mined in caves),\
+            assert isinstance(balance, (float, int)), "Balance should be float object"
+            assert isinstance(caves,list), "Caves should be list object"
+            assert len(caves) <= len(player.caves_list), "Caves list should not exceed length of caves generated"
+            for details in caves: # single pass over the caves list
+                assert isinstance(details,tuple) and len(details)==2, "Caves list should contain tuple of length 2 (cave, mined quantity)"
+                cave, mined = details
+                assert isinstance(cave, Cave) and isinstance(mined, (float, int)),\
                     "Caves list should only contain Cave and float object that does not exceed number of caves generated or is an empty list"
         except AssertionError as e:
             raise ValueError(e)
@@ -529,14 +524,16 @@ class SoloGame(Game):
         
         # check quantities provided O(C), C is number of caves generated, T is number of traders generated
         try:
-            # check all caves visited are generated caves
-            assert all(cave in self.get_caves() for (cave,mined) in caves),"Caves visited are invalid, not generated by game"
-            # check all mined quantities does not exceed the valid caves quantity
-            assert all(mined-EPSILON < cave.get_quantity() for (cave, mined) in caves),"Invalid quantity of mined materials for Cave visited"
-            # check all mined materials are bought by traders
-            assert all(cave.material.name in traded_deals for (cave,mined) in caves),f"Materials that are not traded are mined."
-
-            player_bal, player_hunger = self.player.balance, self.player.hunger_points
+            cave_names = self.cave_names
+            for (cave, mined) in caves: # single pass over the caves visited
+                # check all caves visited are generated caves
+                assert cave.name in cave_names,"Caves visited are invalid, not generated by game"
+                # check all mined quantities does not exceed the valid caves quantity
+                assert mined-EPSILON < cave.quantity,"Invalid quantity of mined materials for Cave visited"
+                # check all mined materials are bought by traders
+                assert cave.material.name in traded_deals,f"Materials that are not traded are mined."
+
+            player_bal, player_hunger = player.balance, player.hunger_points
             # check initial player balance and hunger points
             assert player_bal > EPSILON and player_hunger == 0,f"Invalid initial player balance {player_bal} and hunger points {player_hunger}"
             # check balance provided gives profit or remain unchanged
@@ -547,10 +544,12 @@ class SoloGame(Game):
    
 
         # get boolean value for if there is any purchasable food O(F), F is number of food generated
-        try:
-            purchasable_food = any(food.price < player_bal - EPSILON for food in self.player.foods_list)
-        except AttributeError:
-            purchasable_food = False
+        # only needed by the assertions below, which python -O strips along with this block
+        if __debug__:
+            try:
+                purchasable_food = any(food.price < player_bal - EPSILON for food in player.foods_list)
+            except AttributeError:
+                purchasable_food = False
 
         # check checks relevant to food O(F), F is number of food generated
         try:
@@ -567,18 +566,20 @@ class SoloGame(Game):
             else:
                 assert purchasable_food, "Player could not purchase any food generated"
                 # check food purchased is generated by game
-                assert food in self.player.foods_list, "Food purchased should be generated by game"
+                assert food in player.foods_list, "Food purchased should be generated by game"
                 # check player can purchase food selected
                 assert food.price < player_bal - EPSILON, f"Food price {food.price} exceeded player balance {player_bal}"
 
         except AssertionError as e:
             raise Exception(e)
 
-        # check maximum profit is generated O(C + T + F + [FM + F(log C)] )
-        best_food, best_bal, best_journey = self.player.select_food_and_caves()
-        assert best_food == food, f"Best food should be {best_food}, but {food} purchased"
-        assert best_journey == caves, f"Best caves to yield max profit are not visited"
-        assert best_bal == balance, f"Best balance is {best_bal}, but {balance} obtained"
+        # check maximum profit is generated O(C + T + F + [FM + F(log C)] ), skipped entirely under python -O
+        # the selection is made again here, independently of the outputs being checked
+        if __debug__:
+            best_food, best_bal, best_journey = player.select_food_and_caves()
+            assert best_food == food, f"Best food should be {best_food}, but {food} purchased"
+            assert best_journey == caves, f"Best caves to yield max profit are not visited"
+            assert best_bal == balance, f"Best balance is {best_bal}, but {balance} obtained"
 
 
         # check remaining balance and hunger points O(C), C is number of caves generated
@@ -591,16 +592,21 @@ class SoloGame(Game):
 
                 # player travel caves O(C), C is number of caves generated
                 for (cave, mined) in caves:
+                    material = cave.material
                     # get best deal for current cave material
-                    traded_price = self.trader_deals[cave.material.name].current_price
+                    traded_price = traded_deals[material.name].current_price
                     # increase balance based on materials mined and traded
                     player_bal += mined * traded_price
                     # deplete player hunger based on materials mined
-                    player_hunger -= cave.material.mining_rate * mined
+                    player_hunger -= material.mining_rate * mined
 
                 # ensure remaining hunger points cant mine any more materials O(C), number of caves generated
-                if player_hunger > 0:
-                    assert not any((cave.material.mining_rate*cave.quantity)//player_hunger > 0 for cave in self.caves if not cave.is_visited), f"More materials can be mined with hunger points {player_hunger}"
+                # only the player's caves outside the selection whose material some trader buys are worth mining. The selection
+                # says which caves were visited, is_visited is also set by the foods the player simulated but did not choose
+                if player_hunger > EPSILON:
+                    selected_caves = {cave.name for (cave, mined) in caves}
+                    assert not any((cave.material.mining_rate*cave.quantity)//player_hunger > 0 for cave in player.caves_list
+                                   if cave.name not in selected_caves and cave.material.name in traded_deals), f"More materials can be mined with hunger points {player_hunger}"
 
             # ensure remaining balance is correct
             assert player_bal == balance, f"Balance of {player_bal} does not match {balance}"
@@ -609,25 +615,30 @@ class SoloGame(Game):
             raise Exception(e)       
 
         # prepare caves for next day O(C), C is number of caves generated
+        visited_map = {} # cave name -> (cave, mined_quantity), first occurrence wins
+        for details in caves:
+            if details is not None:
+                visited_map.setdefault(details[0].name, details)
+
         remaining_caves = []
-        for i in range(len(self.caves)):
-            generated_cave = self.caves[i]
+        for generated_cave in self.caves:
             if generated_cave.is_visited:
                 # if the cave was visited, then insert the cave with its updated quantity(could be zero)
-                for j in range(len(caves)):
-                    if caves[j] is not None and generated_cave.name == caves[j][0].name:
-                        assert caves[j][1] <= caves[j][0].quantity, f"Mined quantity {caves[j][1]} must not exceed existing quantity {caves[j][0].quantity}"
-                        caves[j][0].quantity -= caves[j][1]
-                        remaining_caves.append(caves[j][0]) # caves[i] is the tuple of (cave, mined_quantity), caves[i][0] is the cave with updated quantity
-                        break
+                details = visited_map.get(generated_cave.name) # O(1)
+                if details is not None:
+                    visited_cave, mined = details
+                    assert mined <= visited_cave.quantity, f"Mined quantity {mined} must not exceed existing quantity {visited_cave.quantity}"
+                    visited_cave.quantity -= mined
+                    remaining_caves.append(visited_cave) # the cave with updated quantity
             else:
                 remaining_caves.append(generated_cave)
 
         # update the attributes of players after it has passed all tests 
-        self.player.hunger_points = player_hunger
-        self.player.balance = balance
-        self.player.food = food
-        self.player.set_caves(remaining_caves)
+        player.hunger_points = player_hunger
+        player.balance = balance
+        player.food = food
+        player.set_caves(remaining_caves)
+        self._trader_deals_dirty = True # the day is over, deals may be regenerated before the next verification
 
 class MultiplayerGame(Game):
     """
@@ -652,6 +663,7 @@ class MultiplayerGame(Game):
         """
         super().__init__()
         self.players = []
+        self.cave_profits = None # (food, profits per cave) from the last select_for_players, reused by the verifier
 
     def initialise_game(self) -> None:
         """
@@ -662,10 +674,11 @@ class MultiplayerGame(Game):
         super().initialise_game()
         N_PLAYERS = RandomGen.randint(self.MIN_PLAYERS, self.MAX_PLAYERS)
         self.generate_random_players(N_PLAYERS)
+        materials, caves, traders = self.get_materials(), self.get_caves(), self.get_traders()
         for player in self.players: # O(P), where P is the number of players
-            player.set_materials(self.get_materials())
-            player.set_caves(self.get_caves())
-            player.set_traders(self.get_traders())
+            player.set_materials(materials)
+            player.set_caves(caves)
+            player.set_traders(traders)
         # print("Players:\n\t", end="")
         # print("\n\t".join(map(str, self.players)))
 
@@ -704,11 +717,11 @@ class MultiplayerGame(Game):
             raise ValueError("Number of player names does not equal number of emerald info")
         
         super().initialise_with_data(materials, caves, traders)
-        for player, emerald in zip(player_names, emerald_info): 
-            self.players.append(Player(player, emeralds=emerald))
-            self.players[-1].set_materials(self.get_materials())
-            self.players[-1].set_caves(self.get_caves())
-            self.players[-1].set_traders(self.get_traders())
+        materials, caves, traders = self.get_materials(), self.get_caves(), self.get_traders()
+        self.players.extend(
+            Player(player, emeralds=emerald, materials=materials, caves=caves, traders=traders)
+            for player, emerald in zip(player_names, emerald_info)
+        )
         # print("Players:\n\t", end="")
         # print("\n\t".join(map(str, self.players)))
 
@@ -746,6 +759,7 @@ class MultiplayerGame(Game):
         # Best O(T) if all are RandomTraders, Worst O(T * N (CompK * N)) if all are Range/HardTraders
         for trader in self.get_traders(): # O(T)
             trader.generate_deal() # Best O(1) if RandomTrader, Worst O(N * Log N + j-i*log(H)) if Range Trader
+        self._trader_deals_dirty = True # new deals, trader_deals must be rebuilt
 
         # print("Traders Deals:\n\t", end="")
         # print("\n\t".join(map(str, self.get_traders()))) # O(J)
@@ -757,22 +771,24 @@ class MultiplayerGame(Game):
         # print("\n\t".join(map(str, self.get_caves())))
         # 3. Each player selects a cave - The game does this instead.
         foods, balances, caves = self.select_for_players(offered_food)
-        # 4. Quantites for caves is updated, some more stuff is added.
-        self.verify_output_and_update_quantities(foods, balances, caves)
+        # 4. Quantites for caves is updated, some more stuff is added. The choices are only verified when running without -O
+        if __debug__:
+            self._verify(foods, balances, caves)
+        self._update_quantities(foods, balances, caves)
 
     def select_for_players(self, food: Food) -> tuple[list[Food|None], list[float], list[tuple[Cave, float]|None]]:
         """
             Players take turns to buy food if possible, choose a cave to mine materials, sell the material to Trader. 
 
             Step 1: Get best selling prices
-            Approach: LinearProbeTable(key = material_name, value = Trader)
+            Approach: dict(key = material_name, value = Trader)
             Loop through the generated traders, map their current deal's material name to the trader instance. If a trader offers same material 
-            but with higher selling price, update the trader instance in the hash table.
+            but with higher selling price, update the trader instance in the dict.
 
             Step 2: Compute profits for each cave that should be mined from, i.e. the cave's materials can be sold to traders
             Approach: MaxHeap to store each cave's profit
-                      LinearProbeTable(key = string representing profit, value = List[Cave])
-            Loop through generated caves, computing the cave's profit and storing into MaxHeap. Keep track of the cave associated with that
+                      dict(key = profit, value = List[Cave])
+            Loop through generated caves, computing the cave's profit and storing into the heap. Keep track of the cave associated with that
             profit by mapping the profit to the cave. The value of this hash table is a list because it's possible that different caves have same profits,
             so searching for this profit in the hash table yields all the caves with that profit.
             
@@ -782,7 +798,7 @@ class MultiplayerGame(Game):
             If on this player's turn the caves have been depleted, player does nothing. Continue to next player
             Otherwise, simulate mining:
             * Player buys food, decreasing emerald balance
-            * Player uses get_max()from the profit_heap to get maximum profit on their turn, increasing emerald balance from this profit
+            * Player pops from the profit_heap to get maximum profit on their turn, increasing emerald balance from this profit
             * Player checks if it was worth mining (balance >= original balance)
             
             If it was not worth it, player does nothing. Continue to next player (Changes made during the simulation need to be reverted)
@@ -796,127 +812,141 @@ class MultiplayerGame(Game):
             
             :complexity: Best = Worst O(T + C *(log C) + P *log C), where T is number of traders, C is number of caves, P is number of players
         """
-        profit_heap = MaxHeap(len(self.caves)) # O(C)
-        profit_caves = LinearProbeTable(len(self.caves)) # O(C)
-        
         # setup prices
         self.generate_trader_deals_table()
-        trader_deals = self.trader_deals # hash table with current material as key and trader as data
-        
-        # compute profits for each cave based on number of materials mined, and we only choose caves with materials that can be sold
-        for cave in self.caves: # O(C)
-            # NOTE: Due to finish_day()'s functionality, it's possible that the cave will have 0.0 materials
-            if cave.material.name in trader_deals: # O(1) search
-                minable_quantity = food.hunger_bars / cave.material.mining_rate
-                cave_quantity = cave.get_quantity()
+        trader_deals = self.trader_deals # dict with current material name as key and trader as data
 
-                # if quantity in cave less than how much a player can mine
-                if cave_quantity <= minable_quantity:
-                    # mine all in cave
-                    cave.mined_quantity = cave_quantity
-                    cave.remaining_quantity = 0 # indicates that cave is depleted
-                else:
-                    # otherwise mine whatever the player can
-                    cave.mined_quantity = minable_quantity
-                    cave.remaining_quantity = cave_quantity - minable_quantity # there is still some left in cave
-                profit = trader_deals[cave.material.name].current_price * cave.mined_quantity # O(1) search
-                
-                # Hash caves based on its string value of the profit. Each profit string will have its list of caves
-                # if it is a unique profit key, then it is new insert
-                if str(profit) not in profit_caves:
-                    same_profit_caves = []
-                    # print(str(profit) in profit_caves, "Unique profit", profit)
-                    same_profit_caves.append(cave)
-                    profit_caves.insert(str(profit), same_profit_caves)
-                # duplicate profit key, so just update caves
-                elif str(profit) in profit_caves:
-                    # print(str(profit) in profit_caves, "THIS IS THE PROFIT", profit)
-                    profit_caves[str(profit)].append(cave)
-                profit_heap.add(profit)  # insert profit into profit heap, O(log C)
+        # compute profits for each cave based on number of materials mined, and we only choose caves with materials that can be sold
+        # the profits are kept so that verify_output_and_update_quantities can reuse them instead of computing them again
+        cave_profits = self.compute_cave_profits(food) # O(C)
+        self.cave_profits = (food, cave_profits)
+        profit_caves, profit_heap = self.load_cave_profits(cave_profits) # O(C)
 
         caves_visited = []
         players_emerald = []
         foods_bought = []
+        food_price, food_hunger_bars = food.price, food.hunger_bars # the same food is offered to every player
         for player in self.players: # O(P)
-            balance = player.balance
-            hunger_points = player.hunger_points
-            if balance > food.price: # if player can buy food
+            # by default the player does nothing: no food, no cave and an unchanged balance
+            original_balance = player.balance
+            food_out, balance_out, cave_out = None, original_balance, None
+
+            if original_balance > food_price: # if player can buy food
                 player.foods_list = [food]
-                balance -= food.price
-                hunger_points += food.hunger_bars
-                foods_bought.append(food)
-            else:
-                foods_bought.append(None)
-                caves_visited.append(None)
-                players_emerald.append(balance)
-                continue
-
-            # no more caves to mine, so this player, along with the rest can skip
-            if profit_heap.length == 0:
-                # print("All caves have been depleted")
-                # print(f"{player.name} did not buy food. Balance : {player.balance}, Food: None\n \tVisited caves: None")
-                players_emerald.append(player.balance) 
-                player.hunger_points = 0
-                foods_bought.pop()
-                foods_bought.append(None)
-                caves_visited.append(None)
-                continue # go to next player
-
-            # this gives the potential profit from mining all of the material in the cave, but it may not actually be the profit 
-            # gained by the player since the quantity mined is limited by hunger points
-            chosen_cave_profit = profit_heap.get_max() # This method also removes the profit from the heap, O(log C)
-
-            same_profit_caves = profit_caves[str(chosen_cave_profit)] # returns list of caves with same profit - O(1)
-            updated_profit = 0
-            cave = same_profit_caves.pop() # Get one of the caves with that profit(order should not matter)
-
-            # check if it was better to not visit any caves at all
-            balance += chosen_cave_profit
-            if balance < player.balance:
-                # print(f"{player.name} did not buy food and visit {cave.name}. Balance : {player.balance}, Food: None\n \tVisited caves: None")
-                players_emerald.append(player.balance) 
-                player.hunger_points = 0
-                foods_bought.pop()
-                cave.is_visited = False
-                same_profit_caves.append(cave)
-                foods_bought.append(None)
-                caves_visited.append(None)
-                profit_heap.add(chosen_cave_profit) # since we removed the profit from the heap, we must reinsert now, O(log C)
-                continue # go to next player
-            # else:
-                # print(f"{player.name} visited {cave.name} because current max profit that is affordable is {chosen_cave_profit} and they mined {cave.mined_quantity} {cave.material} from the available {cave.quantity}")
-                # print(f"At this point the length of same_profit_caves is {len(same_profit_caves)}")
-
-
-            if cave.remaining_quantity != 0:
-                # updates for next player
-                minable_quantity = food.hunger_bars / cave.material.mining_rate 
-                if minable_quantity < cave.remaining_quantity:
-                    cave.mined_quantity = minable_quantity
-                    cave.remaining_quantity -= minable_quantity
-                    updated_profit = minable_quantity * trader_deals[cave.material.name].current_price
+                balance = original_balance - food_price
+                hunger_points = player.hunger_points + food_hunger_bars
+
+                # no more caves to mine, so this player, along with the rest can skip
+                if not profit_heap:
+                    # print("All caves have been depleted")
+                    player.hunger_points = 0
                 else:
-                    cave.mined_quantity = cave.remaining_quantity
-                    updated_profit = cave.remaining_quantity * trader_deals[cave.material.name].current_price
-                    cave.remaining_quantity = 0
-                if str(updated_profit) not in profit_caves:
-                    profit_caves.insert(str(updated_profit), [cave]) 
+                    # this gives the potential profit from mining all of the material in the cave, but it may not actually be the profit 
+                    # gained by the player since the quantity mined is limited by hunger points
+                    # The profit is only peeked at here, it is removed from the heap once the player decides to mine
+                    chosen_cave_profit = profit_heap.peek_max() # O(1)
+                    same_profit_caves = profit_caves[chosen_cave_profit] # returns list of caves with same profit - O(1)
+
+                    # check if it was better to not visit any caves at all
+                    balance += chosen_cave_profit
+                    if balance < original_balance:
+                        # the heap and the caves with this profit are left untouched
+                        player.hunger_points = 0
+                        same_profit_caves[-1].is_visited = False
+                    else:
+                        profit_heap.get_max() # O(log C)
+                        cave = same_profit_caves.pop() # Get one of the caves with that profit(order should not matter)
+
+                        material = cave.material
+                        remaining_quantity = cave.remaining_quantity
+                        if remaining_quantity != 0:
+                            # updates for next player
+                            minable_quantity = food_hunger_bars / material.mining_rate 
+                            price = trader_deals[material.name].current_price
+                            if minable_quantity < remaining_quantity:
+                                cave.mined_quantity = minable_quantity
+                                cave.remaining_quantity = remaining_quantity - minable_quantity
+                                updated_profit = minable_quantity * price
+                            else:
+                                cave.mined_quantity = remaining_quantity
+                                updated_profit = remaining_quantity * price
+                                cave.remaining_quantity = 0
+                            profit_caves.setdefault(updated_profit, []).append(cave) # O(1)
+                            profit_heap.add(updated_profit) # O(log C)
+
+                        # update stats
+                        hunger_points -= cave.mined_quantity * material.mining_rate 
+                        food_out, balance_out, cave_out = food, balance, (cave, cave.mined_quantity)
+
+            foods_bought.append(food_out)
+            players_emerald.append(balance_out)
+            caves_visited.append(cave_out)
+
+        return (foods_bought, players_emerald, caves_visited)
+
+    def compute_cave_profits(self, food: Food) -> list[tuple[Cave, float, float, float]]:
+        """
+            Computes the quantity a player who bought <food> mines from each cave whose material can be sold, the quantity left
+            in the cave after that and the profit from selling what was mined.
+
+            :param: food - An object of Food
+
+            :pre: generate_trader_deals_table() has been called for the day
+
+            :return: list - A list of tuple(Cave, mined_quantity, remaining_quantity, profit), in the order of the generated caves
+
+            :complexity: Best/Worst O(C), where C is the number of caves
+        """
+        trader_deals = self.trader_deals
+        hunger_bars = food.hunger_bars
+        cave_profits = []
+        for cave in self.caves: # O(C)
+            # NOTE: Due to finish_day()'s functionality, it's possible that the cave will have 0.0 materials
+            material = cave.material
+            trader = trader_deals.get(material.name) # O(1) search
+            if trader is not None:
+                minable_quantity = hunger_bars / material.mining_rate
+                cave_quantity = cave.quantity
+
+                # if quantity in cave less than how much a player can mine
+                if cave_quantity <= minable_quantity:
+                    # mine all in cave
+                    mined_quantity = cave_quantity
+                    remaining_quantity = 0 # indicates that cave is depleted
                 else:
-                    profit_caves[str(updated_profit)].append(cave)
-                profit_heap.add(updated_profit)
+                    # otherwise mine whatever the player can
+                    mined_quantity = minable_quantity
+                    remaining_quantity = cave_quantity - minable_quantity # there is still some left in cave
+                assert mined_quantity <= cave.quantity
+                profit = trader.current_price * mined_quantity
+                cave_profits.append((cave, mined_quantity, remaining_quantity, profit))
+        return cave_profits
+
+    def load_cave_profits(self, cave_profits: list[tuple[Cave, float, float, float]]) -> tuple[dict[float, list[Cave]], MaxHeap[float]]:
+        """
+            Sets each cave's mined and remaining quantities from <cave_profits>, then stores the profits in a MaxHeap
+            and maps each profit to the list of caves with that profit.
 
-            
-            # update stats
-            players_emerald.append(balance)   
-            hunger_points -= cave.mined_quantity * cave.material.mining_rate 
-            caves_visited.append((cave, cave.mined_quantity))
+            :param: cave_profits - A list of tuple(Cave, mined_quantity, remaining_quantity, profit)
 
+            :pre: None
 
+            :return: tuple - (profit_caves, profit_heap)
 
+            :complexity: Best/Worst O(C), where C is the number of caves
+        """
+        profits = [] # heapified once all are added
+        profit_caves = {} # profit as key and list of caves with that profit as data
+        for cave, mined_quantity, remaining_quantity, profit in cave_profits: # O(C)
+            cave.mined_quantity = mined_quantity
+            cave.remaining_quantity = remaining_quantity
             
-        return (foods_bought, players_emerald, caves_visited)
+            # Hash caves based on the profit. Each profit will have its list of caves, a new list for a unique profit key
+            profit_caves.setdefault(profit, []).append(cave) # O(1)
+            profits.append(profit)
+        return profit_caves, MaxHeap.heapify(profits) # O(C)
 
-    def verify_output_and_update_quantities(self, foods: list[Food | None], balances: list[float], caves: list[tuple[Cave, float]|None]) -> None:
+    def _verify(self, foods: list[Food | None], balances: list[float], caves: list[tuple[Cave, float]|None]) -> None:
         """
             Checks inputs:
             a. Quantities are in line with what the players provided. If there are 20 players the input lists should all have 20 entries. The type of list elements also verified.
@@ -945,8 +975,6 @@ class MultiplayerGame(Game):
             b) The cave for that day have been depleted. (If one player encounters this all subsequent players also follow suit)
 
 
-            Updates the quantities for players and visited caves. Then sets caves for the next day.
-
             :param arg1: food (default = None)
 
             :param arg2: balance - the balance of the player
@@ -956,6 +984,10 @@ class MultiplayerGame(Game):
             :pre: None
 
             :return: None
+
+            :raises ValueError: if the inputs are malformed
+
+            :raises Exception: if the choices are invalid or not optimal
             
             :complexity: 
             Worst O(2F + 2B + 2T + 3C + 4P + (C * (C + 2M)) + (F * Fc) + (C * log Ph) + (P * log Ph) + (C ^ 2))
@@ -969,202 +1001,227 @@ class MultiplayerGame(Game):
             Fc is the number of elements in food_choice list
             Ph is the number of nodes in profit heap
         """
-        print("######## VERIFYING ##########")
-        # check input parameters
-        try:
-            # check that length of the three lists in the parameter matches number of players
-            assert len(foods) == len(self.players) and len(balances) == len(self.players) and len(caves) == len(self.players), "Each player must have a choice"
-            # check foods
-            assert isinstance(foods, list) and all((isinstance(food, Food) or food is None) for food in foods), "Foods should be list consisting of Food objects or None"
-            # check balances
-            assert isinstance(balances, list)  and all(isinstance(balance, float) or isinstance(balance, int) for balance in balances), "Balance should be float or int"
-            # check caves
-            assert isinstance(caves, list), "Caves should be list object"
-            assert all((isinstance(details,tuple) or details is None) for details in caves), "Caves list should contain tuple or None"
-            assert all(len(details) == 2 for details in caves if isinstance(details, tuple)), "Caves list tuple should be of length 2: (cave, mined quantity)"
-            for details in caves:
-                if details is not None:
-                    assert isinstance(details[0], Cave), "The tuple's first eleement should be a Cave instance "
-                    assert isinstance(details[1], float) or isinstance(details[1], int), "The tuple's second element should be float or int"
-        except AssertionError as e:
-            raise ValueError(e)
+        if __debug__: # python -O skips these checks
+            # check input parameters
+            try:
+                # check that length of the three lists in the parameter matches number of players
+                assert len(foods) == len(self.players) and len(balances) == len(self.players) and len(caves) == len(self.players), "Each player must have a choice"
+                assert isinstance(foods, list), "Foods should be list consisting of Food objects or None"
+                assert isinstance(balances, list), "Balance should be float or int"
+                assert isinstance(caves, list), "Caves should be list object"
+                # check each player's food, balance and cave in a single pass
+                for food, balance, details in zip(foods, balances, caves):
+                    assert food is None or isinstance(food, Food), "Foods should be list consisting of Food objects or None"
+                    assert isinstance(balance, (float, int)), "Balance should be float or int"
+                    if details is not None:
+                        assert isinstance(details, tuple), "Caves list should contain tuple or None"
+                        assert len(details) == 2, "Caves list tuple should be of length 2: (cave, mined quantity)"
+                        assert isinstance(details[0], Cave), "The tuple's first eleement should be a Cave instance "
+                        assert isinstance(details[1], (float, int)), "The tuple's second element should be float or int"
+            except AssertionError as e:
+                raise ValueError(e)
 
         # setup trader_deals(best prices), profits for each cave available on that day
         self.generate_trader_deals_table()
         trader_deals = self.trader_deals
 
-        # further checks on caves input
-        try: 
-            for details in caves:
-                if details is not None:
-                    # check all caves visited are generated caves
-                    assert details[0] in self.get_caves(),"Caves visited are invalid, not generated by game"
-                    # check all mined quantities does not exceed the valid caves quantity
-                    assert details[1]-EPSILON < details[0].get_quantity(),"Invalid quantity of mined materials for Cave visited"
-                    # check all mined materials are bought by traders
-                    assert details[0].material.name in trader_deals, f"Materials that are not traded are mined."
-        except AssertionError as e:
-            raise Exception(e)
+        if __debug__: # python -O skips these checks
+            # further checks on caves input
+            try: 
+                for details in caves:
+                    if details is not None:
+                        # check all caves visited are generated caves
+                        assert details[0].name in self.cave_names,"Caves visited are invalid, not generated by game"
+                        # check all mined quantities does not exceed the valid caves quantity
+                        assert details[1]-EPSILON < details[0].quantity,"Invalid quantity of mined materials for Cave visited"
+                        # check all mined materials are bought by traders
+                        assert details[0].material.name in trader_deals, f"Materials that are not traded are mined."
+            except AssertionError as e:
+                raise Exception(e)
         
         # further checks on foods
-        try:
-            food_choice = []
-            for food in foods:
-                if food is not None:
-                    if not food.name in food_choice:
-                        food_choice.append(food.name)
-            assert len(food_choice) == 1, "Should only have one food type that players can purchase"
-            # setup food_choice for future checks
-            for food in foods:
-                if food is not None:
-                    food_choice = food
-                    break 
-        except AssertionError as e:
-            raise Exception(e)
-
-        # check initial player balance and hunger points
-        try:
-            for i in range(len(self.players)):
-                assert self.players[i].balance > EPSILON and self.players[i].hunger_points == 0, f"Invalid initial player balance {self.players[i].balance} and hunger points {self.players[i].hunger_points}"
-        except AssertionError as e:
-            raise Exception(e)
+        if __debug__: # python -O skips these checks
+            try:
+                food_choice = []
+                for food in foods:
+                    if food is not None:
+                        if not food.name in food_choice:
+                            food_choice.append(food.name)
+                assert len(food_choice) == 1, "Should only have one food type that players can purchase"
+            except AssertionError as e:
+                raise Exception(e)
+        # setup food_choice for future checks
+        for food in foods:
+            if food is not None:
+                food_choice = food
+                break 
 
-        # check balances provided gives profit or remain unchanged
-        try:
-            player_balances = [player.balance for player in self.players]
-            for i in range(len(balances)):
-                assert balances[i] > player_balances[i] - EPSILON, f"Selection must ensure no losses. Balance after {balances[i]}, Balance Before {player_balances[i]}"
-        except AssertionError as e:
-            raise Exception(e)
+        if __debug__: # python -O skips these checks
+            # check initial player balance and hunger points
+            try:
+                for i in range(len(self.players)):
+                    assert self.players[i].balance > EPSILON and self.players[i].hunger_points == 0, f"Invalid initial player balance {self.players[i].balance} and hunger points {self.players[i].hunger_points}"
+            except AssertionError as e:
+                raise Exception(e)
 
-        # for players who bought food check if they could actually afford it
-        for i in range(len(self.players)):
-            player = self.players[i]
+        if __debug__: # python -O skips these checks
+            # check balances provided gives profit or remain unchanged
             try:
-                if foods[i] is not None:
-                    assert food_choice.price < player.balance - EPSILON, f"Food price of {food_choice.price} exceeded {player.name}'s balance"
+                player_balances = [player.balance for player in self.players]
+                for i in range(len(balances)):
+                    assert balances[i] > player_balances[i] - EPSILON, f"Selection must ensure no losses. Balance after {balances[i]}, Balance Before {player_balances[i]}"
             except AssertionError as e:
-                raise Exception(e)  
+                raise Exception(e)
 
+        if __debug__: # python -O skips these checks
+            # for players who bought food check if they could actually afford it
+            for i in range(len(self.players)):
+                player = self.players[i]
+                try:
+                    if foods[i] is not None:
+                        assert food_choice.price < player.balance - EPSILON, f"Food price of {food_choice.price} exceeded {player.name}'s balance"
+                except AssertionError as e:
+                    raise Exception(e)  
 
 
-        # setup profit for each cave available on that day
-        profit_caves = LinearProbeTable(len(self.caves))
-        profit_heap = MaxHeap(len(self.caves))
-        for cave in self.caves: # O(C)
-            if cave.material.name in trader_deals: # linear probe O(1)
-                minable_quantity = food_choice.hunger_bars / cave.material.mining_rate
-                cave_quantity = cave.get_quantity()
 
-                # if quantity in cave less than how much a player can mine
-                if cave_quantity <= minable_quantity:
-                    # mine all in cave
-                    cave.mined_quantity = cave_quantity
-                    cave.remaining_quantity = 0 # indicates that cave is depleted
-                else:
-                    # otherwise mine whatever the player can
-                    cave.mined_quantity = minable_quantity
-                    cave.remaining_quantity = cave.quantity - minable_quantity # there is still some material left in cave
-                assert cave.mined_quantity <= cave.quantity
-                profit = trader_deals[cave.material.name].current_price * cave.mined_quantity
-                
-                # Hash caves based on its string value of the profit. Each profit string will have its list of caves
-                # if it is a unique profit key, then it is new insert
-                if str(profit) not in profit_caves:
-                    same_profit_caves = []
-                    same_profit_caves.append(cave)
-                    profit_caves.insert(str(profit), same_profit_caves)
-                # duplicate profit key, so just update caves
-                elif str(profit) in profit_caves:
-                    profit_caves[str(profit)].append(cave)
-                profit_heap.add(profit)  # insert profit into profit heap
+        # setup profit for each cave available on that day, reusing the profits computed by select_for_players for this food if any
+        if self.cave_profits is not None and self.cave_profits[0] is food_choice:
+            cave_profits = self.cave_profits[1]
+        else:
+            cave_profits = self.compute_cave_profits(food_choice) # O(C)
+        self.cave_profits = None
+        profit_caves, profit_heap = self.load_cave_profits(cave_profits) # O(C)
 
         # check if player made optimal choices to get best balances
+        food_price, food_hunger_bars = food_choice.price, food_choice.hunger_bars # the same food is offered to every player
         for i in range(len(self.players)):
             player = self.players[i]
+            original_balance = player.balance
             try:
                 # cannot afford food
-                if player.balance < food_choice.price:
-                    balance = player.balance
-                    hunger_points = 0
+                if original_balance < food_price:
+                    balance = original_balance
                     assert foods[i] is None and caves[i] is None and balances[i] == balance, f"{player.name} should do nothing(can't afford food)"
                 # can afford food
                 else:
                     # if caves are depleted for that day, this player (and any other subsequent players) should do nothing
-                    if profit_heap.length == 0: 
-                        assert foods[i] is None and caves[i] is None and balances[i] == player.balance, "Player cannot do anything because all caves are depleted"
-                        hunger_points = 0
+                    if not profit_heap: 
+                        assert foods[i] is None and caves[i] is None and balances[i] == original_balance, "Player cannot do anything because all caves are depleted"
                         continue # directly go to next player
 
                     # player thinks about whether it is worth it to mine
-                    balance = player.balance - food_choice.price # assume player bought food
-                    max_profit = profit_heap.get_max() # choose highest profit possible, this will remove the profit from the heap
-                    same_profit_caves = profit_caves[str(max_profit)] # get list of caves with that max profit
-                    chosen_cave = same_profit_caves.pop() # go to one of those caves, this will remove the cave
+                    balance = original_balance - food_price # assume player bought food
+                    max_profit = profit_heap.peek_max() # choose highest profit possible, only peeked at until the player mines
+                    same_profit_caves = profit_caves[max_profit] # get list of caves with that max profit
                     balance += max_profit # assume that player got profit from that cave
 
                     # if above attempt resulted in a loss, then player does nothing
-                    if balance < player.balance: 
-                        assert foods[i] is None and caves[i] is None and balances[i] == player.balance, f"{player.name} should do" + \
-                            f"nothing({max_profit} from mining less than cost of {food_choice.price})"
-                        hunger_points = 0
-                        same_profit_caves.append(chosen_cave) # need to reinsert because we removed it previously
-                        profit_heap.add(max_profit) # need to reinsert because we removed it previously
+                    if balance < original_balance: 
+                        assert foods[i] is None and caves[i] is None and balances[i] == original_balance, f"{player.name} should do" + \
+                            f"nothing({max_profit} from mining less than cost of {food_price})"
                         continue
                     # if the attempt was profitable (balance > original balance)
                     else:
+                        profit_heap.get_max() # remove the profit from the heap
+                        chosen_cave = same_profit_caves.pop() # go to one of those caves, this will remove the cave
                         assert foods[i] == food_choice, f"{player.name} should have bought food: {food_choice.name}"
                         assert caves[i][0] == chosen_cave, f"{player.name} should have visited {chosen_cave.name} because {chosen_cave} gives profit of {max_profit}, instead visited {caves[i][0]}"
                         assert balances[i] == balance, f"{player.name}'s balance of {balances[i]} does not match expected {balance} after mining"
-                        hunger_points = food_choice.hunger_bars
                         
                         # if chosen_cave has remaining material, recalculate profit and reinsert into hash table and heap
                         if chosen_cave.remaining_quantity != 0:
 
                             # updates for next player
-                            minable_quantity = food_choice.hunger_bars / chosen_cave.material.mining_rate 
+                            minable_quantity = food_hunger_bars / chosen_cave.material.mining_rate 
+                            price = trader_deals[chosen_cave.material.name].current_price
                             if minable_quantity < chosen_cave.remaining_quantity:
                                 chosen_cave.mined_quantity = minable_quantity
                                 chosen_cave.remaining_quantity -= minable_quantity
-                                updated_profit = minable_quantity * trader_deals[chosen_cave.material.name].current_price
+                                updated_profit = minable_quantity * price
                             else:
                                 chosen_cave.mined_quantity = chosen_cave.remaining_quantity
-                                updated_profit = chosen_cave.remaining_quantity * trader_deals[chosen_cave.material.name].current_price
+                                updated_profit = chosen_cave.remaining_quantity * price
                                 chosen_cave.remaining_quantity = 0
-                            if str(updated_profit) not in profit_caves:
-                                profit_caves.insert(str(updated_profit), [chosen_cave]) 
-                            else:
-                                profit_caves[str(updated_profit)].append(chosen_cave)
-                            profit_heap.add(updated_profit)
+                            profit_caves.setdefault(updated_profit, []).append(chosen_cave) # O(1)
+                            profit_heap.add(updated_profit) # O(log C)
             
             except AssertionError as e:
                 raise Exception(e)
 
+    def _update_quantities(self, foods: list[Food | None], balances: list[float], caves: list[tuple[Cave, float]|None]) -> None:
+        """
+            Updates the quantities of the visited caves and the players' balances, hunger points and foods. Then sets caves for the next day.
+            No checks are made, see _verify.
+
+            :param arg1: foods - the food bought by each player or None
+
+            :param arg2: balances - the balance of each player
+
+            :param arg3: caves - the tuple(Cave, mined_quantity) visited by each player or None
+
+            :pre: the choices were produced by select_for_players or passed _verify
+
+            :return: None
+
+            :complexity: Best/Worst O(C + P), where C is the number of caves generated and P is the number of players
+        """
         # prepare caves for next day
+        visited_map = {} # cave name -> (cave, mined_quantity), first occurrence wins
+        for details in caves: # caves: List[(cave, mined_quantity)]
+            if details is not None:
+                visited_map.setdefault(details[0].name, details)
+
         remaining_caves = []
-        for i in range(len(self.caves)): # These are the generated caves that were used to initialize the game. 
-            generated_cave = self.caves[i]
+        for generated_cave in self.caves: # These are the generated caves that were used to initialize the game. 
             # if the cave was visited, its quantities need to be updated according to what was mined
             if generated_cave.is_visited: 
-                for j in range(len(caves)): # caves: List[(cave, mined_quantity)] 
-                    if caves[j] is not None and generated_cave.name == caves[j][0].name:
-                        assert caves[j][1] <= caves[j][0].quantity, f"Mined quantity {caves[j][1]} must not exceed existing quantity {caves[j][0].quantity}"
-                        caves[j][0].quantity -= caves[j][1] # decrement the cave's quantity
-                        # reset is_visited
-                        caves[j][0].is_visited = False
-                        remaining_caves.append(caves[j][0]) 
-                        break
+                details = visited_map.get(generated_cave.name) # O(1)
+                if details is not None:
+                    visited_cave, mined = details
+                    assert mined <= visited_cave.quantity, f"Mined quantity {mined} must not exceed existing quantity {visited_cave.quantity}"
+                    visited_cave.quantity -= mined # decrement the cave's quantity
+                    # reset is_visited
+                    visited_cave.is_visited = False
+                    remaining_caves.append(visited_cave) 
 
             # if the cave was not visited, just add it(no need to modify its quantity)
             else:
                 remaining_caves.append(generated_cave)
 
-        # update the attributes of players after it has passed all tests 
+        # every player is left with the hunger points of the last player's turn: the food's hunger bars if they mined, otherwise 0
+        hunger_points = 0
+        if caves and caves[-1] is not None:
+            hunger_points = foods[-1].hunger_bars
+
+        # update the attributes of players
         for i in range(len(self.players)):
             self.players[i].hunger_points = hunger_points
             self.players[i].balance = balances[i]
             self.players[i].foods_list = [foods[i]]
             self.players[i].set_caves(remaining_caves)
+        self._trader_deals_dirty = True # the day is over, deals may be regenerated before the next selection
+
+    def verify_output_and_update_quantities(self, foods: list[Food | None], balances: list[float], caves: list[tuple[Cave, float]|None]) -> None:
+        """
+            Checks the players' choices, then updates the quantities for players and visited caves and sets caves for the next day.
+            :see: #self._verify(foods, balances, caves)
+            :see: #self._update_quantities(foods, balances, caves)
+
+            :param arg1: foods - the food bought by each player or None
+
+            :param arg2: balances - the balance of each player
+
+            :param arg3: caves - the tuple(Cave, mined_quantity) visited by each player or None
+
+            :pre: None
+
+            :return: None
+
+            :complexity: Same as _verify, which dominates _update_quantities
+        """
+        self._verify(foods, balances, caves)
+        self._update_quantities(foods, balances, caves)
 
 # if __name__ == "__main__":
 #     g = MultiplayerGame()
@@ -13,11 +13,14 @@ __modified__ = '21/05/2020'
 __since__ = '14/05/2020'
 
 
-from referential_array import ArrayR
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterator
 from primes import LargestPrimeIterator
 T = TypeVar('T')
 
+# Shared entry of every empty slot. Its home position of -1 never matches a key's hash, so a probe can compare homes
+# before checking whether the slot is empty.
+_EMPTY = (None, None, -1)
+
 
 class LinearProbeTable(Generic[T]):
     """
@@ -25,9 +28,11 @@ class LinearProbeTable(Generic[T]):
 
         Attributes:
             count: number of elements in the hash table
-            table: used to represent our internal array
+            table: used to represent our internal array, each slot is _EMPTY or a tuple of (key, data, home position)
             tablesize: current size of the hash table
     """
+    # table size -> size of the table after rehashing, shared by all tables since the prime search only depends on the size
+    _rehash_sizes = {}
 
     def __init__(self, expected_size: int, tablesize_override: int = -1) -> None:
         """
@@ -58,7 +63,7 @@ class LinearProbeTable(Generic[T]):
             table_size = prime
         self.tablesize = table_size
 
-        self.table = ArrayR(self.tablesize) # create the table, O(N)
+        self.table = [_EMPTY] * self.tablesize # create the table as a plain list, indexing it avoids a Python level call per slot, O(N)
 
         # Statistics 
         self.rehash_count = 0
@@ -82,9 +87,15 @@ class LinearProbeTable(Generic[T]):
         value = 0
         a = 31415 # start with a prime coefficient
         hash_base = 31 # prime base
-        for char in key: 
-            value = (ord(char) + a * value) % self.tablesize
-            a = a * hash_base % (self.tablesize - 1) # coefficient changes for each position pseudo-randomly, tablesize-1 is coprime with tablesize
+        tablesize = self.tablesize
+        coefficient_mod = tablesize - 1
+        try:
+            codes = key.encode('ascii') # iterating bytes yields the character codes directly, no ord() per character
+        except UnicodeEncodeError:
+            codes = map(ord, key) # non-ASCII keys hash the same code points
+        for code in codes: 
+            value = (code + a * value) % tablesize
+            a = a * hash_base % coefficient_mod # coefficient changes for each position pseudo-randomly, tablesize-1 is coprime with tablesize
         
         return value
 
@@ -126,13 +137,13 @@ class LinearProbeTable(Generic[T]):
         """
         return self.count
 
-    def _linear_probe(self, key: str, is_insert: bool) -> int:
+    def _linear_probe(self, key: str) -> int:
         """
-            Find the correct position for this key in the hash table using linear probing
+            Find the position of this key in the hash table using linear probing.
+            Entries are placed by Robin Hood hashing (see _robin_hood_insert), so the search stops as soon as it reaches an entry
+            that is closer to its home position than the key would be: the key cannot be stored any further along.
 
-            :param arg1: key - the key I wish to find
-
-            :param arg2: is_insert - if True, the key exists in the table
+            :param: key - the key I wish to find
 
             :pre: None
 
@@ -141,39 +152,146 @@ class LinearProbeTable(Generic[T]):
             :complexity: Best O(K) if first position is empty, where K is the size of the key
                          Worst O(K + N) when we've searched the entire table, where N is the tablesize, K is key comparison
             
-            :raises KeyError: When a position can't be found
+            :raises KeyError: When the key is not in the table
+        """
+        home = self.hash(key)  # get the position using hash, O(N)
+        position = home
+        distance = 0 # distance probed from the key's home position
+        table = self.table
+        tablesize = self.tablesize
+
+        # __setitem__ rehashes before the table is more than half full, so there is always an empty slot that ends the search
+        while True:  # start traversing
+            entry = table[position]
+            entry_home = entry[2]
+            if entry_home == home and entry[0] == key:  # found key, only entries with the same home can hold it
+                return position
+            elif entry is _EMPTY:  # found empty slot, so the key is not in
+                raise KeyError(key)
+            else:  # there is something but not the key
+                entry_distance = position - entry_home # distance of the stored entry from its home position
+                if entry_distance < 0:
+                    entry_distance += tablesize
+                if entry_distance < distance: # the stored entry is closer to home than the key would be
+                    raise KeyError(key)
+                position += 1 # try next, wrap around with a compare instead of a modulo on every probe
+                if position == tablesize:
+                    position = 0
+                distance += 1
+
+    def _robin_hood_insert(self, key: str, data: T) -> None:
         """
-        position = self.hash(key)  # get the position using hash, O(N)
-        probe_chain = 0 # reset probe_chain
+            Insert (key, data) using Robin Hood hashing: while probing, the entry being carried takes the slot of any stored entry
+            that is closer to its home position, and the evicted entry is carried on instead. This keeps probe lengths even.
+            Each slot stores (key, data, home position) so the distance of a stored entry from its home needs no rehashing.
 
-        if is_insert and self.is_full():
-            raise KeyError(key)
+            :param arg1: key - the string I wish to insert
 
-        for _ in range(len(self.table)):  # start traversing
-            if self.table[position] is None:  # found empty slot
-                if is_insert:
-                    # print("position of " + key + " is " + str(position))
+            :param arg2: data - the item I wish to insert
 
-                    # update probe_max if new probe_chain is larger than previous
-                    if probe_chain > self.probe_max: 
-                        self.probe_max = probe_chain
+            :pre: the table is not full
 
-                    # update conflict count(happens when linear probing is required to find a position for the value being inserted)
-                    if probe_chain != 0: # probe_chain != 0 means the first position was not None so linear probe occured at least once
-                        self.conflict_count += 1
-                    return position
-                else:
-                    raise KeyError(key)  # so the key is not in
+            :return: None
 
-            elif self.table[position][0] == key:  # found key
-                return position
-            else:  # there is something but not the key, try next
-                position = (position + 1) % len(self.table)
-                self.probe_total += 1 # update total probe chain length
-                probe_chain += 1
+            :complexity: Best O(K) if first position is empty, where K is the size of the key
+                         Worst O(K + N) when we've searched the entire table, where N is the tablesize, K is key comparison
+        """
+        home = self.hash(key)  # get the position using hash, O(N)
+        position = home
+        distance = 0 # distance probed from the key's home position
+        table = self.table
+        tablesize = self.tablesize
+
+        # search for the key until the first slot the key would take, a stored entry can only be further along if none was displaced
+        # __setitem__ rehashes before the table is more than half full, so there is always an empty slot that ends the search
+        while True:  # start traversing
+            entry = table[position]
+            entry_home = entry[2]
+            if entry_home == home and entry[0] == key:  # found key, only entries with the same home can hold it
+                table[position] = (key, data, home) # update its data in place
+                self.probe_total += distance # update total probe chain length
+                return
+            elif entry is _EMPTY:  # found empty slot
+                break
+            entry_distance = position - entry_home # distance of the stored entry from its home position
+            if entry_distance < 0:
+                entry_distance += tablesize
+            if entry_distance < distance: # stored entry is closer to home, the key is not in the table and takes this slot
+                break
+            position += 1 # try next, wrap around with a compare instead of a modulo on every probe
+            if position == tablesize:
+                position = 0
+            distance += 1
+
+        probe_chain = distance + self._robin_hood_place(table, position, (key, data, home), distance)
+        self.count += 1 # update number of elements since it's an insertion
+        self.probe_total += probe_chain # update total probe chain length
+
+        # update probe_max if new probe_chain is larger than previous
+        if probe_chain > self.probe_max: 
+            self.probe_max = probe_chain
+
+        # update conflict count(happens when linear probing is required to find a position for the value being inserted)
+        if probe_chain != 0: # probe_chain != 0 means the first position was not empty so linear probe occured at least once
+            self.conflict_count += 1
+
+    @staticmethod
+    def _robin_hood_place(table: list, position: int, carried: tuple, distance: int) -> int:
+        """
+            Place <carried> into <table> from <position>, where it is <distance> from its home position. The carried entry takes the
+            slot of any stored entry that is closer to its home, and the evicted entry is carried on instead until an empty slot is found.
+            Shared by _robin_hood_insert and _rehash.
+
+            :param arg1: table - the slots to place the entry into
+
+            :param arg2: position - the slot to start from
 
+            :param arg3: carried - the (key, data, home position) entry to place, its key is not in <table>
 
-        raise KeyError(key) 
+            :param arg4: distance - the distance of <position> from the home position of <carried>
+
+            :pre: <table> has an empty slot
+
+            :return: int - the number of slots probed past <position>
+
+            :complexity: Best O(1) if <position> is empty
+                         Worst O(N), where N is the size of <table>
+        """
+        tablesize = len(table)
+        probes = 0
+        while True:
+            entry = table[position]
+            if entry is _EMPTY:
+                table[position] = carried
+                return probes
+            entry_distance = position - entry[2] # distance of the stored entry from its home position
+            if entry_distance < 0:
+                entry_distance += tablesize
+            if entry_distance < distance: # stored entry is closer to home, it gives up its slot to the carried entry
+                table[position] = carried
+                carried = entry
+                distance = entry_distance
+            position += 1 # try next, wrap around with a compare instead of a modulo on every probe
+            if position == tablesize:
+                position = 0
+            distance += 1
+            probes += 1
+
+    def items(self) -> Iterator[tuple[str, T]]:
+        """
+            Yields every (key, value) pair in the hash table, without building a list.
+
+            :param: None
+
+            :pre: The table is not modified while iterating
+
+            :return: generator of tuple(key, value)
+            
+            :complexity: Best/Worst O(N), when N is size of hash table
+        """
+        for entry in self.table:
+            if entry is not _EMPTY:
+                yield entry[0], entry[1]
 
     def keys(self) -> list[str]:
         """
@@ -187,11 +305,7 @@ class LinearProbeTable(Generic[T]):
             
             :complexity: Best/Worst O(N), when N is size of hash table
         """
-        res = []
-        for x in range(len(self.table)): 
-            if self.table[x] is not None:
-                res.append(self.table[x][0])
-        return res
+        return [entry[0] for entry in self.table if entry is not _EMPTY]
 
     def values(self) -> list[T]:
         """
@@ -205,11 +319,7 @@ class LinearProbeTable(Generic[T]):
             
             :complexity: Best/Worst O(N), when N is size of hash table
         """
-        res = []
-        for x in range(len(self.table)):
-            if self.table[x] is not None:
-                res.append(self.table[x][1])
-        return res
+        return [entry[1] for entry in self.table if entry is not _EMPTY]
 
     def __contains__(self, key: str) -> bool:
         """
@@ -236,7 +346,7 @@ class LinearProbeTable(Generic[T]):
     def __getitem__(self, key: str) -> T:
         """
             Get the item at a certain key
-            :see: #self._linear_probe(key: str, is_insert: bool)
+            :see: #self._linear_probe(key: str)
             :raises KeyError: when the item doesn't exist
 
             :param: key - the string I wish to search
@@ -248,13 +358,13 @@ class LinearProbeTable(Generic[T]):
             :complexity: Best O(K) first position is empty, where K is the size of the key
                          Worst O(K + N) when we've searched the entire table, where N is the tablesize
         """
-        position = self._linear_probe(key, False)
+        position = self._linear_probe(key)
         return self.table[position][1]
 
     def __setitem__(self, key: str, data: T) -> None:
         """
             Set an (key, data) pair in our hash table
-            :see: #self._linear_probe(key: str, is_insert: bool)
+            :see: #self._robin_hood_insert(key: str, data: T)
             :see: #self.__contains__(key: str)
 
             :param arg1: key - the string I wish to set
@@ -270,18 +380,13 @@ class LinearProbeTable(Generic[T]):
                          else O(K + M) when we've searched the entire table, where M is the tablesize, K is key comparison
         """
         # print("Inserting " + key + " and count is " + str(self.count))
-        # rehash if number of elements in the hash table is more than half
+        # rehash if number of elements in the hash table is more than half, keeping the load factor at or below ~0.5 to limit clustering
         if self.count > self.tablesize/2:
             self._rehash()
             self.rehash_count += 1 # update rehash count
             # print("Inserting " + key + " and count is " + str(self.count))
 
-        position = self._linear_probe(key, True)
-
-        if self.table[position] is None:
-            self.count += 1 # update number of elements if it's an insertion
-
-        self.table[position] = (key, data)
+        self._robin_hood_insert(key, data)
 
     def is_empty(self) -> bool:
         """
@@ -341,27 +446,33 @@ class LinearProbeTable(Generic[T]):
 
             :return: None
 
-            :complexity: Best/Worst O(M*(K+M)), where M is the table size, K is the size of the key
+            :complexity: Best/Worst O(M*(K+M)), where M is the table size, K is the size of the key.
+                         The prime search for the new size is only done the first time a table of this size is rehashed.
         """
-        keys = self.keys() # O(M), when M is size of hash table
-        values = self.values() # O(M), when M is size of hash table
-        potential_new_size = self.tablesize * 2 # double the original size
-        # print("Potential new size is", potential_new_size)
-
-        # Find the first prime number greater than or equal to potential new size and make it the new table size
-        prime = int()
-        primes = LargestPrimeIterator(potential_new_size, 2)
-        while prime < potential_new_size:
-            prime = next(primes) # O(A*N), where N is the upper bound and A is the potential new size
-        new_table_size = prime
+        old_table = self.table
+        new_table_size = self._rehash_sizes.get(self.tablesize) # O(1) when a table of this size has been rehashed before
+        if new_table_size is None:
+            potential_new_size = self.tablesize * 2 # double the original size
+            # print("Potential new size is", potential_new_size)
+
+            # Find the first prime number greater than or equal to potential new size and make it the new table size
+            prime = int()
+            primes = LargestPrimeIterator(potential_new_size, 2)
+            while prime < potential_new_size:
+                prime = next(primes) # O(A*N), where N is the upper bound and A is the potential new size
+            new_table_size = self._rehash_sizes[self.tablesize] = prime
         
-        self.table = ArrayR(new_table_size) # O(M), where M is the table size
-        self.tablesize = new_table_size # reset table size
-        self.count = 0 # reset the number of elements in the table
+        table = [_EMPTY] * new_table_size # O(M), where M is the table size
+        self.table = table
+        self.tablesize = new_table_size # reset table size, count is unchanged as every element is reinserted
 
-        # reinsert everything, O(M*(K+M))
-        for key, value in zip(keys, values): # loop O(M) times
-            self.insert(key, value) # O(K+M),where M is the table size, K is the size of the key(there should not be another rehash called)
+        # reinsert everything straight from the old table, O(M*(K+M))
+        # keys in the old table are unique, so there is no search for an existing key and the statistics are left untouched
+        place = self._robin_hood_place
+        for entry in old_table: # loop O(M) times
+            if entry is not _EMPTY:
+                home = self.hash(entry[0]) # O(K), where K is the size of the key
+                place(table, home, (entry[0], entry[1], home), 0) # the new table is at most half full, O(M)
 
 
     def __str__(self) -> str:
@@ -377,12 +488,7 @@ class LinearProbeTable(Generic[T]):
 
             :complexity: O(N) where N is the table size
         """
-        result = ""
-        for item in self.table:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
-        return result
+        return "".join("(" + str(key) + "," + str(value) + ")\n" for key, value in self.items()) # one join instead of repeated +=
 
 
 # if __name__ == "__main__":
@@ -70,6 +70,31 @@ class MaxHeap(Generic[T]):
 
         self.the_array[k] = item
         
+    def peek_max(self) -> T:
+        """
+        Return the maximum element without removing it from the heap.
+
+        :complexity: Best/Worst O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[1]
+
+    @classmethod
+    def heapify(cls, items: list[T]) -> MaxHeap[T]:
+        """
+        Build a heap from all of <items> at once, sinking from the last parent up to the root.
+
+        :complexity: Best/Worst O(N)*OCompare, where N is len(items)
+        """
+        heap = cls(len(items))
+        for i, item in enumerate(items, 1):
+            heap.the_array[i] = item
+        heap.length = len(items)
+        for k in range(heap.length // 2, 0, -1):
+            heap.sink(k)
+        return heap
+
     def get_max(self) -> T:
         """ 
         Remove (and return) the maximum element from the heap. 
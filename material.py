@@ -7,6 +7,7 @@ name and a unique mining rate.
 
 
 from __future__ import annotations
+from sys import intern
 from random_gen import RandomGen
 
 # Material names taken from https://minecraft-archive.fandom.com/wiki/Items
@@ -93,6 +94,7 @@ RANDOM_MATERIAL_NAMES = [
     "Wheat",
     "Netherite Ingot",
 ]
+RANDOM_MATERIAL_NAMES = [intern(name) for name in RANDOM_MATERIAL_NAMES] # interned so that equal names are the same object
 
 class Material:
     """
@@ -103,7 +105,10 @@ class Material:
         * mining Rate: Specifies how many hunger points are needed to mine a single unit of the material (can be a fractional number)
         * found_in: Specifies the caves the material can be found in
         * ratio: the ratio of emeralds earned from mining it(profit) to hunger points required to mine it(cost)
+        * total_quantity: how much of it can be mined from the caves in found_in
     """
+
+    __slots__ = ('name', 'mining_rate', 'found_in', 'ratio', 'total_quantity')
     
     def __init__(self, name: str, mining_rate: float) -> None:
         """
@@ -119,10 +124,11 @@ class Material:
 
             :complexity: Best=Worst O(1)
         """
-        self.name = name
+        self.name = intern(name) # interned so that __eq__ can compare names by identity
         self.mining_rate = mining_rate # number of hunger points needed to mine one material
         self.found_in = [] # list of caves the material can be found in
         self.ratio = None # ratio of profit to cost
+        self.total_quantity = 0 # quantity that can be mined from the caves in found_in
     
     def __str__(self) -> str:
         """
@@ -151,9 +157,8 @@ class Material:
 
             :complexity: Best=Worst O(1)
         """
-        same_name = (self.name == other.name)
-        same_mining_rate = (self.mining_rate == other.mining_rate) 
-        return (same_name or same_mining_rate) # returns False only when both attributes are different
+        # names are interned at initialisation so equal names are the same object, mining rates are only compared if names differ
+        return self.name is other.name or self.mining_rate == other.mining_rate # returns False only when both attributes are different
            
 
     @classmethod
@@ -173,6 +178,31 @@ class Material:
         random_mining_rate = RandomGen.random_float() * RandomGen.randint(10, 20) # arbitrary generation of mining rate
         return Material(random_name, random_mining_rate)
 
+    @classmethod
+    def random_material_batch(cls, amount: int) -> list[Material]:
+        """
+            Generates and returns <amount> random materials in one call. Names may repeat, duplicates are left to the caller.
+            Draws from RandomGen in the same order as calling random_material <amount> times, so seeded runs are unchanged.
+
+            :param: amount - the number of materials to generate
+
+            :pre: None
+
+            :return: list of random Material objects
+
+            :complexity: Best/Worst O(N), where N is <amount>
+        """
+        randint = RandomGen.randint
+        random_float = RandomGen.random_float
+        names = RANDOM_MATERIAL_NAMES
+        last_name = len(names) - 1
+        materials = [None] * amount
+        for i in range(amount):
+            random_name = names[randint(0, last_name)] # same draw as RandomGen.random_choice(RANDOM_MATERIAL_NAMES)
+            random_mining_rate = random_float() * randint(10, 20)
+            materials[i] = cls(random_name, random_mining_rate)
+        return materials
+
 if __name__ == "__main__":
     print(Material("Coal", 4.5))
 
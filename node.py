@@ -13,6 +13,8 @@ __docformat__ = 'reStructuredText'
 class TreeNode(Generic[K, I]):
     """ Node class represent BST nodes. """
 
+    __slots__ = ('key', 'item', 'left', 'right')
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -39,6 +41,8 @@ class AVLTreeNode(TreeNode, Generic[K, I]):
     """ Node class for AVL trees.
     """
 
+    __slots__ = ('height', 'size')
+
     def __init__(self, key: K, item: I = None) -> None:
         """
             Initialises the node with a key and optional item
@@ -11,7 +11,6 @@ from typing import List
 
 from cave import Cave
 from constants import EPSILON
-from hash_table import LinearProbeTable
 from material import Material
 from node import AVLTreeNode
 from random_gen import RandomGen
@@ -19,13 +18,12 @@ from sorted_list import ListItem
 from trader import Trader, RandomTrader
 from food import Food
 from avl import AVLTree
-from hash_table import LinearProbeTable
 from array_sorted_list import ArraySortedList
 from heap import *
 
 
 # List taken from https://minecraft.fandom.com/wiki/Mob
-PLAYER_NAMES = [
+PLAYER_NAMES = (
     "Steve",
     "Alex",
     "ɘᴎiɿdoɿɘH",
@@ -105,7 +103,8 @@ PLAYER_NAMES = [
     "Zombie",
     "Zombie Villager",
     "H̴͉͙̠̥̹͕͌̋͐e̸̢̧̟͈͍̝̮̹̰͒̀͌̈̆r̶̪̜͙̗̠̱̲̔̊̎͊̑̑̚o̷̧̮̙̗̖̦̠̺̞̾̓͆͛̅̉̽͘͜͝b̸̨̛̟̪̮̹̿́̒́̀͋̂̎̕͜r̸͖͈͚̞͙̯̲̬̗̅̇̑͒͑ͅi̶̜̓̍̀̑n̴͍̻̘͖̥̩͊̅͒̏̾̄͘͝͝ę̶̥̺̙̰̻̹̓̊̂̈́̆́̕͘͝͝"
-]
+)
+_LAST_PLAYER_NAME = len(PLAYER_NAMES) - 1 # index of the last name, for random_player
 
 class Player():
     """
@@ -120,15 +119,18 @@ class Player():
         * foods_list: Choices of food offered to player to buy.
         * materials_list: The materials from the caves that can be mined by the player.
         * caves_list: The caves the player can visit to mine materials.
+        * food: The food the player bought on the last simulated day.
     """
 
+    __slots__ = ('name', 'balance', 'hunger_points', 'traders_list', 'foods_list', 'materials_list', 'caves_list', 'food')
+
     # Constants for random generation of player's starting emeralds
     DEFAULT_EMERALDS = 50
 
     MIN_EMERALDS = 14
     MAX_EMERALDS = 40
 
-    def __init__(self, name, emeralds=None) -> None:
+    def __init__(self, name, emeralds=None, materials=None, caves=None, traders=None) -> None:
         """
             Initialises attributes.
             
@@ -136,6 +138,12 @@ class Player():
 
             :param arg2: emeralds - the number of emralds the player has (default = None)
 
+            :param arg3: materials - A list of Material objects the player has access to (default = None, no materials)
+
+            :param arg4: caves - A list of Cave objects the player has access to (default = None, no caves)
+
+            :param arg5: traders - A list of Trader objects the player has access to (default = None, no traders)
+
             :pre: None
 
             :return: None
@@ -145,10 +153,11 @@ class Player():
         self.name = name
         self.balance = self.DEFAULT_EMERALDS if emeralds is None else emeralds
         self.hunger_points = 0
-        self.traders_list = []
+        self.traders_list = [] if traders is None else traders
         self.foods_list = []
-        self.materials_list = []
-        self.caves_list = []
+        self.materials_list = [] if materials is None else materials
+        self.caves_list = [] if caves is None else caves
+        self.food = None
 
     def set_traders(self, traders_list: list[Trader]) -> None:
         """
@@ -191,7 +200,7 @@ class Player():
             
             :complexity: Best/Worst O(1)
         """
-        random_name = RandomGen.random_choice(PLAYER_NAMES)
+        random_name = PLAYER_NAMES[RandomGen.randint(0, _LAST_PLAYER_NAME)] # same draw as RandomGen.random_choice(PLAYER_NAMES)
         random_emeralds = RandomGen.randint(self.MIN_EMERALDS, self.MAX_EMERALDS)
         return Player(random_name, random_emeralds)
 
@@ -243,22 +252,23 @@ class Player():
 
                 Setups:
                 * For each unique material to be mined, keep track of its quantity and the caves it can be found in.
-                Approach: LinearProbeTable with material name as key and value is tuple of (total_minable_quantity, Material)
+                Approach: dict with material name as key and value is a copy of the Material, holding its total_quantity and found_in caves
 
                 * Get best selling prices
-                Approach: LinearProbeTable(key = material_name, value = Trader)
+                Approach: dict(key = material_name, value = Trader)
                 Loop through the generated traders, map their current deal's material name to the trader instance. If a trader offers 
-                same material but with higher selling price, update the trader instance in the hash table.
+                same material but with higher selling price, update the trader instance in the dict.
 
                 Simulate for each food type bought:
-                If player cannot afford food, do nothing. Otherwise, simulate buying food, decreasing emerald balance and increasing hunger bars.
+                If player cannot afford any food, do nothing. Foods the player cannot afford are skipped. Otherwise, simulate buying food,
+                decreasing emerald balance and increasing hunger bars.
                     * For each material, compute the ratio (profit obtained by mining  / hunger_points needed to mine) where the quantity 
-                    is total_minable_quantity(from the available caves)
-                    * Store these ratios in MaxHeap. Use LinearProbeTable to map these ratios to the material name.
+                    is the total_quantity(from the available caves). The ratios do not depend on the food, so this is only done for
+                    the first food bought.
+                    * Store these ratios in MaxHeap, then drain it once into a plan shared by all foods, from highest to lowest ratio.
+                    Equal ratios are separate entries, taken out in the order the materials were found.
                     * While player still has hunger points, visit as many caves as possible. If all caves visited, exit loop early
-                        Get max ratio using get_max() from ratio_heap. 
-                        Search for material name based on ratio. 
-                        Search for Material based on material name
+                        Walk the plan in order
                         Get cave(s) to be visited based on Material.found_in
                         Mine from those caves 
                     * if balance < original balance, Player does nothing. Else mine accordingly
@@ -269,84 +279,94 @@ class Player():
 
                 :return: tuple - (the food which the player will buy, the emerald latest balance, A list of caves that player visits)
 
-                :complexity: Best = Worst = O(C + T + F + [FM + F(log C)] ),
+                :complexity: Best = Worst = O(C + T + M log M + FC),
                              where M, T, F and C represent the number of materials, traders, foods and caves respectively.
             """
-            # materials_table has material name as key and the data is a [tuple[quantity, Material]], where quantity is how much of it
-            # can be mined from all the caves containing it, and material is the material
-            materials_table = LinearProbeTable(len(self.materials_list), -1)
+            # materials_table has material name as key and the data is a copy of the Material, whose total_quantity is how much of it
+            # can be mined from all the caves containing it and whose found_in is those caves
+            # the player does nothing if no food can be bought, so there is no need to set up anything, O(F)
+            if not any(food.price < self.balance - EPSILON for food in self.foods_list):
+                return (None, self.balance, [])
+
+            materials_table = {}
             for current_cave in self.caves_list: #! O(C)
-                if current_cave.material.name not in materials_table:
-                    materials_table.insert(current_cave.material.name, (current_cave.quantity, Material(current_cave.material.name, current_cave.material.mining_rate)))
+                cave_material = current_cave.material
+                material_name = cave_material.name
+                material = materials_table.get(material_name)
+                if material is None:
+                    material = Material(material_name, cave_material.mining_rate)
+                    material.total_quantity = current_cave.quantity
+                    materials_table[material_name] = material
                 else:
-                    # if there is an existing cave in the table with the same material, update the quantity and the caves
-                    existing_quantity = materials_table[current_cave.material.name][0] # get existing quantity of material from table
-                    existing_material = materials_table[current_cave.material.name][1]
-                    materials_table.insert(current_cave.material.name, (existing_quantity + current_cave.quantity, existing_material )) # update by adding current quantity to existing quantity
-                materials_table[current_cave.material.name][1].found_in.append(current_cave) # add cave to found_in
+                    # if there is an existing cave in the table with the same material, update the quantity by adding current quantity
+                    material.total_quantity = material.total_quantity + current_cave.quantity
+                material.found_in.append(current_cave) # add cave to found_in
 
             # Setup the potential selling prices. Players only find traders who are willing to buy the mined materials.
-            trader_deals = LinearProbeTable(len(self.traders_list), -1) # hash table with current material as key and trader as data
+            trader_deals = {} # dict with current material as key and trader as data
             for trader in self.traders_list: #! O(T)
                 material = trader.current_material.name # get trader's current material name as key
-                if material in trader_deals: # if there is an existing trader in the table selling the same material
-                    price = trader_deals[material].current_price # get the existing trader's price
+                best_trader = trader_deals.get(material) # existing trader in the table selling the same material, if any
 
-                    # if current trader's price is higher than in the table, replace existing trader with current trader
-                    if trader.current_price > price:
-                        trader_deals.insert(material, trader)
-                else:
-                    trader_deals.insert(material, trader) # otherwise it is a new insert
+                # new insert, or current trader's price is higher than in the table, so it replaces the existing trader
+                if best_trader is None or trader.current_price > best_trader.current_price:
+                    trader_deals[material] = trader
 
 
-            # repeat for each food type bought
-            caves_for_each_food = []
+            # the ratios do not depend on the food bought, so the plan of materials sorted by ratio is only made once,
+            # when the first food is bought
+            plan = None
+            # repeat for each food type bought, keeping the best (food, visited_caves, balance) so far. The first affordable food is the
+            # default choice, it is only replaced by a food giving a balance higher than max_balance
+            best_choice = None
+            max_balance = 0
             for food in self.foods_list: #! O(F)
                 visited_caves = []
                 balance = self.balance         # emeralds
-                if balance >= food.price:       # only enter if can purchase food
+                if food.price < balance - EPSILON:       # only enter if can purchase food, the same rule the game verifies
                     balance -= food.price
                     # print(f"{food.name} BOUGHT. Current emeralds: {self.balance} - {food.price} = {balance}")
                     hunger_points = food.hunger_bars
                 else:
                     # print("Player cannot buy food and has no hunger points to mine anything")
-                    return (None, self.balance, [])
-                    # break
-
-                # get ratios for each material and put into MaxHeap
-                ratios_heap = MaxHeap(len(materials_table)) #! O(M), M <= C
-                if len(materials_table) < 3:
-                    material_dict = LinearProbeTable(3)
-                else:
-                    material_dict = LinearProbeTable(len(materials_table))
-                for material_name in materials_table.keys(): # for each material that can be mined from caves
-                    try:
-                        trader = trader_deals[material_name]
-                    except KeyError:
-                        print("This material is not part of trader's deals and should not be mined")
-                    else:
-                        material = materials_table[material_name][1]
-                        quantity = materials_table[material_name][0]
-                        # cost
-                        mining_rate = material.mining_rate
-                        hunger_points_required = quantity * mining_rate
-                        # profit
-                        selling_price = trader_deals[material_name].current_price
-                        profit = quantity * selling_price
-                        # assign ratio
-                        material.ratio = profit / hunger_points_required
-                        ratios_heap.add(material.ratio) # O(log M)
-                        material_dict[str(material.ratio)] = material_name # map the ratio to the material name ,O(1) for hash table
+                    continue # a later food may still be affordable
+
+                if plan is None:
+                    # get ratios for each material and put into MaxHeap
+                    ratios_heap = MaxHeap(len(materials_table)) # O(M), M <= C
+                    for index, (material_name, material) in enumerate(materials_table.items()): # for each material that can be mined from caves, O(M)
+                        try:
+                            trader = trader_deals[material_name]
+                        except KeyError:
+                            print("This material is not part of trader's deals and should not be mined")
+                        else:
+                            quantity = material.total_quantity
+                            # cost
+                            mining_rate = material.mining_rate
+                            hunger_points_required = quantity * mining_rate
+                            # profit
+                            selling_price = trader.current_price
+                            profit = quantity * selling_price
+                            # assign ratio
+                            material.ratio = profit / hunger_points_required
+                            # equal ratios are kept as separate entries, the negated index takes them out in table order so
+                            # the Materials themselves are never compared. The price is kept so mining needs no lookup
+                            ratios_heap.add((material.ratio, -index, material, selling_price)) # O(log M)
+
+                    # drain the heap once into the plan, from highest to lowest ratio, O(M log M)
+                    plan = []
+                    while len(ratios_heap) > 0:
+                        ratio, _, material, selling_price = ratios_heap.get_max()
+                        plan.append((ratio, material, selling_price))
  
                 # The sum of the iterations in the for loop will equal O(C)
-                while hunger_points > 0 and ratios_heap.length > 0: # will visit as many caves as possible until hunger points depleted 
-                    max_ratio = ratios_heap.get_max() #! O(log C) 
-                    mat_name = material_dict[str(max_ratio)]
-                    mat_chosen = materials_table[mat_name] # tuple of (quantity, Material)
-
-                    for cave in mat_chosen[1].found_in: 
-                        mining_rate = mat_chosen[1].mining_rate
-                        price = trader_deals[mat_name].current_price
+                for _, material, price in plan: # will visit as many caves as possible until hunger points depleted 
+                    if hunger_points <= 0:
+                        break
+
+                    # the same for every cave of the chosen material
+                    mining_rate = material.mining_rate
+                    for cave in material.found_in: 
                         potential_cost = cave.quantity * mining_rate
                         potential_profit = cave.quantity * price
 
@@ -373,22 +393,17 @@ class Player():
                 if balance < self.balance:
                     food = None
                     balance = self.balance
-                    for cave, quantity in visited_caves:
+                    for cave, _ in visited_caves:
                         cave.is_visited = False
                     visited_caves = []
 
-                caves_for_each_food.append((food, visited_caves, balance))
+                if best_choice is None:
+                    best_choice = (food, visited_caves, balance)
+                if balance > max_balance:
+                    best_choice = (food, visited_caves, balance)
+                    max_balance = balance
 
-            max_balance = 0
-            max_idx = 0
-            for i in range(len(caves_for_each_food)): #! O(F)
-                if caves_for_each_food[i][2] > max_balance:
-                    max_idx = i
-                    max_balance = caves_for_each_food[i][2]
-            best_choice = caves_for_each_food[max_idx] # (food, visited_caves, balance)
-            best_food = best_choice[0]
-            best_journey = best_choice[1] # list of traversed caves
-            best_balance = best_choice[2]
+            best_food, best_journey, best_balance = best_choice # best_journey is the list of traversed caves
 
             return (best_food, best_balance, best_journey)
 
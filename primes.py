@@ -11,6 +11,9 @@ import math
 __author__ = 'Code by Wong Jia Cheng'
 __docformat__ = 'reStructuredText'
 
+# results of the trial divisions done by is_prime, shared by every iterator since primality does not depend on the bound
+_prime_cache = {}
+
 class LargestPrimeIterator():
     """ 
         Computes and returns the largest prime number that is strictly less than the current value of the upper bound
@@ -66,15 +69,14 @@ class LargestPrimeIterator():
             
             :complexity: O(N), where N is self.upper_bound
         """
-        current = self.upper_bound 
-
         # start with upper_bound - 1 (the first value less than upper bound), and keep decrementing until a prime is found. 
         # Assuming the factor is 2, the prime will be between previous upper bound(N) and new upper bound(2N) so iterates a maximum of n times, hence O(N)
         # Chebyshev's theorem states that there is a prime number in the interval (n,2n] for int n > 0
-        while True:
+        current = self.upper_bound - 1
+        if current > 2 and current % 2 == 0: # 2 is the only even prime, so only odd candidates are tested
             current -= 1
-            if self.is_prime(current): # when current is prime, stop
-                break 
+        while not self.is_prime(current): # when current is prime, stop. 3 is prime so current never goes below it
+            current -= 2
 
         self.upper_bound = current * self.factor # update upper bound for next call
         return current
@@ -90,17 +92,28 @@ class LargestPrimeIterator():
 
             :return: boolean - True if it is prime
             
-            :complexity: Best O(1) when n <= 2 or n is even or 
-                         Worst O(sqrt(n)), when we need to test the divisibility (sqrt(n)+1 - 3) times
+            :complexity: Best O(1) when n <= 3, n is divisible by 2 or 3 or n has been tested before
+                         Worst O(sqrt(n)), when we need to test the divisibility by about sqrt(n)/3 candidates
         """
-        if n == 2:
-            return True
-        if (n < 2) or (n % 2 == 0): # if n is less than 2 or even it is not prime
+        if n < 4: # 2 and 3 are prime, anything less than 2 is not
+            return n >= 2
+        if n % 2 == 0 or n % 3 == 0: # multiples of 2 or 3
             return False
 
-        # For each odd integer(which is why we increment by two) in the range of 3 until the square root of n, check if it divides n
-        # n is prime if and only if all of these integers do not divide n. 
-        return not any(n % i == 0 for i in range(3, int(math.sqrt(n)) + 1, 2))
+        # Every prime greater than 3 is of the form 6k-1 or 6k+1, so only those integers in the range of 5 until the square root of n
+        # are checked. n is prime if and only if none of them divide n. isqrt is exact, unlike int(math.sqrt(n)) for large n
+        result = _prime_cache.get(n)
+        if result is None:
+            result = True
+            limit = math.isqrt(n)
+            i = 5
+            while i <= limit:
+                if n % i == 0 or n % (i + 2) == 0:
+                    result = False
+                    break
+                i += 6
+            _prime_cache[n] = result
+        return result
     
 if __name__ == "__main__":
     it = LargestPrimeIterator(6,2)
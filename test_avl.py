@@ -140,6 +140,33 @@ class TestAVL(unittest.TestCase):
         self.assertEqual(tree.range_between(1, 5), [2, 3, 4, 5, 6], "Range between failed")
 
 
+    def test_from_sorted(self):
+        for length in (0, 1, 2, 7, 100):
+            with self.subTest(length):
+                keys = list(range(length))
+                tree = AVLTree.from_sorted(keys, [k * 10 for k in keys])
+                self.height = {}  # clearing the cache
+
+                self.assertEqual(len(tree), length)
+                self.assertEqual([key for key in tree], keys, 'In-Order traversal produces a wrong order')
+                self.assertTrue(self.check_invariant(tree.root), 'The invariant does not hold!')
+                self.assertTrue(self.check_balance(tree.root), 'The tree is unbalanced!')
+                if length > 0:
+                    self.assertEqual(tree.root.size, length)
+                    self.assertEqual(tree.root.height, self.get_height(tree.root))
+                    self.assertEqual(tree.range_between(0, length - 1), [k * 10 for k in keys])
+
+        # the built tree supports the usual updates
+        tree = AVLTree.from_sorted([1, 3, 5], ['a', 'b', 'c'])
+        tree[4] = 'd'
+        del tree[1]
+        self.assertEqual(tree.range_between(0, 2), ['b', 'd', 'c'])
+
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([1, 1], ['a', 'b'])
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([1, 2], ['a'])
+
 if __name__ == '__main__':
     # seeding the pseudo-random generator
     random.seed(16)
@@ -47,6 +47,24 @@ class TestHashTable(unittest.TestCase):
         self.assertGreaterEqual(probe_max, 3)    # Jon: 3  + Whatever rehash caused
         self.assertEqual(rehash, 1)              # 1 rehash
 
+    def test_lookup_miss_stops_early(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in "Amy, Ann, Bob, Cat, Dan".split(", "):
+            table[name] = name + "-value" # placed in slots 8 to 12, every entry after Amy is 1 from its home
+
+        class CountingList(list):
+            reads = 0
+            def __getitem__(self, index):
+                CountingList.reads += 1
+                return list.__getitem__(self, index)
+
+        table.table = CountingList(table.table)
+        # Axe's home is 8, by slot 10 it would be 2 from home but Bob is only 1 from his, so Axe cannot be further along
+        self.assertRaises(KeyError, lambda: table["Axe"])
+        self.assertEqual(CountingList.reads, 3) # Amy, Ann, Bob, instead of probing on to the empty slot 13
+        self.assertEqual(table["Dan"], "Dan-value")
+
 if __name__ == '__main__':
 
     # running all the tests
@@ -16,6 +16,17 @@ class TestMaterial(unittest.TestCase):
         except Exception:
             raise AssertionError("Unable to instantiate material with correct inputs")
 
+    def test_random_material_batch(self):
+        # a batch must draw the same materials as calling random_material that many times
+        RandomGen.set_seed(16)
+        expected = [Material.random_material() for _ in range(20)]
+        RandomGen.set_seed(16)
+        batch = Material.random_material_batch(20)
+        self.assertEqual(len(batch), 20)
+        for material, expected_material in zip(batch, expected):
+            self.assertEqual(material.name, expected_material.name)
+            self.assertEqual(material.mining_rate, expected_material.mining_rate)
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
@@ -1,5 +1,9 @@
 from random_gen import RandomGen
 from player import Player
+from material import Material
+from cave import Cave
+from food import Food
+from trader import HardTrader
 import unittest
 
 
@@ -16,6 +20,24 @@ class TestPlayer(unittest.TestCase):
         except Exception:
             raise AssertionError("Unable to instantiate player with correct inputs")
 
+    def test_unaffordable_food_skipped(self):
+        # an unaffordable food in the middle of the list must not stop a later, affordable food from being chosen
+        gold = Material("Gold Nugget", 2)
+        cave = Cave("Castle Cave", gold, 10)
+        trader = HardTrader("Steve")
+        trader.set_all_materials([gold])
+        trader.generate_deal()
+        player = Player("Enderman", 50)
+        player.set_caves([cave])
+        player.set_traders([trader])
+        player.set_foods([Food("Cooked Chicken Cuts", 2, 10), Food("Fried Rice", 500, 60), Food("Cabbage Seeds", 100, 20)])
+        food, balance, caves = player.select_food_and_caves()
+        self.assertEqual(food.name, "Cabbage Seeds")
+        self.assertEqual(len(caves), 1)
+        self.assertEqual(caves[0][0], cave)
+        self.assertEqual(caves[0][1], 10)
+        self.assertAlmostEqual(balance, 50 - 20 + 10 * trader.current_price)
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
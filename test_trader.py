@@ -157,6 +157,40 @@ class TestTraders(unittest.TestCase):
         # check that the deal matches
         self.assertEqual(str(rando), "<HardTrader: Mr Barnes buying [Gunpowder: 8🍗/💎] for 2.01💰>", "Deal check failed")
 
+    def test_sorted_tree_cache(self):
+        # the sorted tree is built once and reused until the inventory changes
+        rando = RangeTrader("Mr Barnes")
+        rando.set_all_materials([Material("Amethyst", 1), Material("Emerald", 2), Material("Ruby", 3)])
+        tree = rando.get_sorted_tree()
+        self.assertIs(rando.get_sorted_tree(), tree, "Sorted tree was rebuilt without the inventory changing")
+
+        # adding a material inserts it into the cached tree instead of rebuilding it
+        rando.add_material(Material("Diamond", 4))
+        self.assertIs(rando.get_sorted_tree(), tree, "Sorted tree was rebuilt after add_material")
+        self.assertEqual(len(tree), 4)
+        self.assertIn(4, tree)
+        self.assertEqual([str(x) for x in rando.materials_between(2, 3)], ["Ruby: 3🍗/💎", "Diamond: 4🍗/💎"])
+
+        # setting a new inventory discards the cached tree
+        rando.set_all_materials([Material("Arrow", 5)])
+        self.assertIsNot(rando.get_sorted_tree(), tree, "Sorted tree was not rebuilt after set_all_materials")
+        self.assertEqual(len(rando.get_sorted_tree()), 1)
+
+    def test_hard_deal_updates_sorted_tree(self):
+        # the material a HardTrader deals is removed from an already built sorted tree as well as from the inventory
+        RandomGen.set_seed(16)
+        rando = HardTrader("Mr Barnes")
+        rando.set_all_materials([Material("Amethyst", 1), Material("Emerald", 2), Material("Ruby", 3)])
+        tree = rando.get_sorted_tree()
+        rando.generate_deal()
+        self.assertEqual(rando.current_deal()[0].name, "Ruby")
+        self.assertIs(rando.get_sorted_tree(), tree, "Sorted tree was rebuilt after a deal")
+        self.assertEqual(len(tree), 2)
+        self.assertNotIn(3, tree)
+        rando.generate_deal()
+        self.assertEqual(rando.current_deal()[0].name, "Emerald")
+        self.assertEqual(list(tree), [1])
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
@@ -9,14 +9,14 @@ Traders are differentiated by their names only, so it's possible for traders to
 from __future__ import annotations
 
 from abc import abstractmethod, ABC
+from sys import intern
 from material import Material
 from random_gen import RandomGen
 from array_list import ArrayList
 from avl import AVLTree
-from bst import BSTInOrderIterator
 
 # Generated with https://www.namegenerator.co/real-names/english-name-generator
-TRADER_NAMES = [
+TRADER_NAMES = (
     "Pierce Hodge",
     "Loren Calhoun",
     "Janie Meyers",
@@ -77,7 +77,8 @@ TRADER_NAMES = [
     "Jo Bass",
     "Cora Kramer",
     "Taylor Schultz",
-]
+)
+TRADER_NAMES = tuple(intern(name) for name in TRADER_NAMES) # interned so that equal names are the same object
 
 class Trader(ABC):
     """
@@ -86,11 +87,16 @@ class Trader(ABC):
 
         Attributes:
         * name: Used to differentiate between traders
-        * inventory: the materials that the trader can buy
+        * _inventory: the materials that the trader can buy, private so it only changes through methods that keep sorted_tree in step
         * current_material: the material the trader currently wants from the player
         * current_price: the price the trader offers to buy the current material 
+        * sorted_tree: the inventory sorted by mining rate, rebuilt only when the inventory has changed
 
     """
+
+    # sell is never read by the game, it only gives example.py and example_multi.py somewhere to store the deal they set by hand
+    __slots__ = ('name', '_inventory', 'current_material', 'current_price', 'sorted_tree', '_sorted_tree_dirty', 'sell')
+
     def __init__(self, name: str) -> None:
         """
             Initialises attributes
@@ -103,15 +109,18 @@ class Trader(ABC):
 
             :complexity: Best = Worst O(N), where N is the size of the inventory
         """
-        self.name = name
-        self.inventory = ArrayList(10) # arbitrary value of 10 given
+        self.name = intern(name) # interned so that __eq__ can compare names by identity
+        self._inventory = ArrayList(10) # arbitrary value of 10 given
         self.current_material = None
         self.current_price = None
+        self.sorted_tree = None
+        self._sorted_tree_dirty = True # the inventory changed since sorted_tree was built
 
     @classmethod 
     def random_trader(cls) -> RandomTrader | RangeTrader | HardTrader:
         """
-            Returns a RandomTrader or a RangeTrader or a HardTrader with a random name
+            Returns a trader with a random name. Called on Trader, the trader is a RandomTrader or a RangeTrader or a HardTrader,
+            chosen randomly. Called on one of these subclasses, the trader is of that subclass.
 
             :param: None
 
@@ -121,14 +130,9 @@ class Trader(ABC):
             
             :complexity: Best = Worst O(N), where N is the size of the inventor
         """
-        random_name = RandomGen.random_choice(TRADER_NAMES)
-        random_type = RandomGen.random_choice([RandomTrader, RangeTrader, HardTrader])
-        if random_type == RandomTrader:
-            return RandomTrader(random_name)
-        elif random_type == RangeTrader:
-            return RangeTrader(random_name)
-        elif random_type == HardTrader:
-            return HardTrader(random_name)
+        random_name = RandomGen.random_choice(TRADER_NAMES) # the name is drawn before the type
+        random_type = RandomGen.random_choice(_TRADER_CLASSES) if cls is Trader else cls
+        return random_type(random_name)
 
     @abstractmethod
     def generate_deal(self):
@@ -136,7 +140,8 @@ class Trader(ABC):
     
     def set_all_materials(self, mats: list[Material]) -> None:
         """
-            Sets the inventory of the trader with the list of Materials given
+            Sets the inventory of the trader with the list of Materials given.
+            The new inventory is allocated with room for all of them, so appending never has to resize it.
 
             :param: mats - A list of Material objects
 
@@ -146,13 +151,15 @@ class Trader(ABC):
 
             :complexity: O(N), where N is the size of the list of Materials
         """
-        self.inventory.clear()
+        inventory = ArrayList(len(mats))
         for mat in mats:
-            self.inventory.append(mat)
+            inventory.append(mat)
+        self._inventory = inventory
+        self._sorted_tree_dirty = True
     
     def add_material(self, mat: Material) -> None:
         """
-            Adds a Material into the inventory
+            Adds a Material into the inventory. If the sorted tree is already built, the Material is inserted into it as well.
 
             :param: mats - A list of Material objects
 
@@ -162,7 +169,12 @@ class Trader(ABC):
 
             :complexity: O(N), where N is the size of <mats>, the list of Materials 
         """
-        self.inventory.append(mat)
+        self._inventory.append(mat)
+        if not self._sorted_tree_dirty:
+            try:
+                self.sorted_tree[mat.mining_rate] = mat # O(log N)
+            except ValueError: # duplicate mining rate, left for the rebuild to report when the tree is next needed
+                self._sorted_tree_dirty = True
     
     def is_currently_selling(self) -> bool:
         """
@@ -176,7 +188,7 @@ class Trader(ABC):
 
             :complexity: Best = Worst O(1)
         """
-        return not self.current_material is None
+        return self.current_material is not None
 
     def current_deal(self) -> tuple[Material, float]:
         """
@@ -190,8 +202,9 @@ class Trader(ABC):
 
             :complexity: Best = Worst O(1)
         """
-        if self.is_currently_selling():
-            return (self.current_material, self.current_price)
+        current_material = self.current_material # same check as is_currently_selling, without the extra call
+        if current_material is not None:
+            return (current_material, self.current_price)
         else:
             raise ValueError("No deal currently")
 
@@ -237,7 +250,21 @@ class Trader(ABC):
 
             :complexity: Best = Worst O(1)
         """
-        return self.name == other.name 
+        return self.name is other.name # names are interned at initialisation so equal names are the same object
+
+    def __hash__(self) -> int:
+        """
+            Returns the hash of the trader, consistent with __eq__ since traders are equal when their names are
+
+            :param: None
+
+            :pre: None
+
+            :return: int
+
+            :complexity: Best = Worst O(1)
+        """
+        return hash(self.name)
 
     def random_price(self) -> float:
         """
@@ -255,25 +282,35 @@ class Trader(ABC):
 
     def get_sorted_tree(self) -> AVLTree:
         '''
-            Helper method that returns an AVLTree sorted based on material's mining rate
+            Helper method that returns an AVLTree sorted based on material's mining rate.
+            The tree is kept in sorted_tree and only rebuilt when the inventory has changed since it was last built.
 
             :return: AVLTree that is sorted based on material's mining rate
 
-            :complexity: Best = Worst = O(N * log N) where N is the number of materials in the inventory
+            :complexity: Best = O(1) when the inventory has not changed
+                         Worst = O(N * log N) where N is the number of materials in the inventory
         '''
-        total_mats = len(self.inventory)
+        if not self._sorted_tree_dirty:
+            return self.sorted_tree
+
+        inventory = self._inventory
         sorted_tree = AVLTree()
 
         # Insert to AVLTree
-        for x in range(total_mats): # O(N)
-            sorted_tree[self.inventory[x].mining_rate] = self.inventory[x] # O(log N)
+        for x in range(len(inventory)): # O(N)
+            material = inventory[x]
+            sorted_tree[material.mining_rate] = material # O(log N)
         
+        self.sorted_tree = sorted_tree
+        self._sorted_tree_dirty = False
         return sorted_tree
     
 
 class RandomTrader(Trader):
     """When generating a deal, a random material is selected from their inventory, and a random buy price is selected."""
 
+    __slots__ = ()
+
     def __init__(self, name: str) -> None:
         """
             Initialises attributes
@@ -301,29 +338,15 @@ class RandomTrader(Trader):
             :complexity: Best = Worst O(1)
         """
 
-        self.current_material = RandomGen.random_choice(self.inventory)
+        self.current_material = RandomGen.random_choice(self._inventory)
         self.current_price = self.random_price() # random price
 
-    @classmethod
-    def random_trader(cls) -> RandomTrader:
-        """
-            Returns a RandomTrader
-
-            :param: None
-
-            :pre: None
-
-            :return: An object of RandomTrader
-            
-            :complexity: Best = Worst O(N), where N is the size of the inventory
-        """
-        random_name = RandomGen.random_choice(TRADER_NAMES)
-        return RandomTrader(random_name)
-
 
 class RangeTrader(Trader):
     """Generates ith to jth materials from their inventory in descending mining rate and randomly chooses one material from this"""
 
+    __slots__ = ()
+
     def __init__(self, name: str) -> None:
         """
             Initialises attributes.
@@ -337,12 +360,12 @@ class RangeTrader(Trader):
             :complexity: Best = Worst O(N), where N is the size of the inventory
         """
         Trader.__init__(self, name)
-        self.sorted_tree = None
         
     def generate_deal(self) -> None:
         """
-            Generate the deal: Generate list of ith to jth easiest to mine Materials from inventory, and randomly choose a Material.
+            Generate the deal: Randomly choose a Material among the ith to jth easiest to mine Materials from inventory.
                                Random price.
+            The chosen rank is looked up in the sorted tree directly, so the list of ith to jth Materials is never built.
 
             :param: None
 
@@ -350,21 +373,21 @@ class RangeTrader(Trader):
 
             :return: None
 
-            :complexity: Best = Worst O(N * Log N + j-i*log(H)), where N is number of materials in inventory and H is the height of the tree
+            :complexity: Best = O(log N) when the inventory has not changed since the last deal
+                         Worst = O(N * Log N), where N is number of materials in inventory
         """
-        total_mats = len(self.inventory)
+        inventory = self._inventory
+        total_mats = len(inventory)
         if total_mats > 1:
             i = RandomGen.randint(0, total_mats-1) # The first number, i, is selected from 0 to the number of available materials - 1
             j = RandomGen.randint(i, total_mats-1) # The second number, j, is selected from i to the number of available materials - 1
             
-            # generates a list of all materials which lie between the ith easiest to mine and the jth easiest to mine
-            self.sorted_tree = self.get_sorted_tree() # O(N * log N)
-            material_list = self.materials_between(i,j) # O(j-i*log(H))
-
-            # choose a Material randomly from this list
-            self.current_material = RandomGen.random_choice(material_list)
+            # choose a Material randomly from those which lie between the ith easiest to mine and the jth easiest to mine.
+            # randint(i, j) is the rank random_choice would pick from materials_between(i, j), for the same random number
+            sorted_tree = self.get_sorted_tree() # O(N * log N) if the inventory changed, else O(1)
+            self.current_material = sorted_tree.lookup(sorted_tree.root, RandomGen.randint(i, j)).item # O(log N)
         else:
-            self.current_material = self.inventory[0]
+            self.current_material = inventory[0]
         
         # a random buy price is selected
         self.current_price = self.random_price()
@@ -374,8 +397,7 @@ class RangeTrader(Trader):
         """
             Helper Method that returns a list containing the materials which are somewhere between the ith and jth easiest to mine, inclusive
 
-            Since this is a helper method we will be checking if this method is called from generate_deals function
-            If it is not called from generate_deals function, we will generate call function get_sorted_tree()
+            The sorted tree is only rebuilt by get_sorted_tree() if the inventory has changed since it was last built
 
             :param arg1: i - the starting index 
 
@@ -385,38 +407,17 @@ class RangeTrader(Trader):
 
             :return: List which contains objects of Material
 
-            :complexity: Best Case = O(j-i*log(H))
-                         Worst Case = O(N * log N + j-i*log(H)), where N is number of materials in inventory and H is the height of the tree
-        """
-        # Check whether current method is called from generate_deals function if not this means it's not sorted yet
-        if self.sorted_tree == None:
-            self.sorted_tree = self.get_sorted_tree() # O(N * log N)
-        
-        materials_list = self.sorted_tree.range_between(i, j) # O(j-i*log(H))
-        self.sorted_tree = None 
-        return materials_list
-
-
-    @classmethod
-    def random_trader(cls) -> RangeTrader:
+            :complexity: Best Case = O(log(N) + j-i)
+                         Worst Case = O(N * log N + j-i), where N is number of materials in inventory
         """
-            Returns a RangeTrader
-
-            :param: None
-
-            :pre: None
-
-            :return: An object of RangeTrader
-            
-            :complexity: Best = Worst O(N), where N is the size of the inventory
-        """
-        random_name = RandomGen.random_choice(TRADER_NAMES)
-        return RangeTrader(random_name)
+        return self.get_sorted_tree().range_between(i, j) # O(N * log N) if the inventory changed, then O(log(N) + j-i)
 
 
 class HardTrader(Trader):
     """Always gets hardest to mine material from their inventory"""
 
+    __slots__ = ()
+
     def __init__(self, name: str) -> None:
         """
             Initialises attributes.
@@ -430,52 +431,42 @@ class HardTrader(Trader):
             :complexity: Best = Worst O(N), where N is the size of the inventory
         """
         Trader.__init__(self, name)
-        self.sorted_tree = None
 
     def generate_deal(self) -> None:
         """
             Generate the deal: Get the hardest to mine Material from inventory. Random price.
+            The hardest to mine Material is found with a single pass over the inventory, no sorted tree is needed for one maximum.
 
             :param: None
 
-            :pre: None
+            :pre: the inventory is not empty
 
             :return: None
 
-            :complexity: Best = Worst O(N * log N + N), where N is number of materials in inventory
-        """
-        self.sorted_tree = self.get_sorted_tree() # O(N * log N)
-        self.current_material = self.sorted_tree.get_maximal(self.sorted_tree.root).item # O(log N)
-        self.inventory.remove(self.current_material) # O(N), shuffling required
+            :complexity: Best = Worst O(N), where N is number of materials in inventory
+        """
+        inventory = self._inventory
+        last = len(inventory) - 1
+        if last < 0:
+            raise ValueError("No materials in the inventory to make a deal")
+
+        # find the material with the highest mining rate, O(N)
+        best_index = 0
+        best = inventory[0]
+        for index in range(1, last + 1):
+            material = inventory[index]
+            if material.mining_rate > best.mining_rate:
+                best_index = index
+                best = material
+        self.current_material = best
+
+        # the inventory is unordered, so the last material fills the gap instead of shuffling everything left, O(1)
+        inventory[best_index] = inventory[last]
+        inventory.delete_at_index(last)
+        if not self._sorted_tree_dirty:
+            del self.sorted_tree[best.mining_rate] # keep an already built sorted tree in step, O(log N)
         self.current_price = self.random_price() # a random buy price is selected
 
-    @classmethod
-    def random_trader(cls) -> HardTrader:
-        """
-            Returns a HardTrader
-
-            :param: None
-
-            :pre: None
-
-            :return: An object of HardTrader class
-            
-            :complexity: Best = Worst O(N), where N is the size of the inventory
-        """
-        random_name = RandomGen.random_choice(TRADER_NAMES)
-        return HardTrader(random_name)
-
-
-
-
-
-
-
-
-    
-
-
-
-
-
 
+# the trader types Trader.random_trader chooses from
+_TRADER_CLASSES = (RandomTrader, RangeTrader, HardTrader)